@@ -0,0 +1,84 @@
+"""
+Micro-batching for AI microcalls
+
+Concurrent requests arriving within a short window are combined into a single
+OpenAI call; each caller gets back its own item from the batched response.
+"""
+
+import asyncio
+import json
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import openai
+
+
+class MicroBatcher:
+    """Coalesce concurrent single-item prompts into one batched chat completion"""
+
+    def __init__(self, system_prompt: str, window_seconds: float, max_batch_size: int):
+        self.system_prompt = system_prompt
+        self.window_seconds = window_seconds
+        self.max_batch_size = max_batch_size
+        self._pending: List[Tuple[str, str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._in_flight: Set[asyncio.Task] = set()
+        self._next_id = 0
+
+    async def submit(self, client: openai.AsyncOpenAI, model: str, timeout: float, text: str) -> Optional[Dict[str, Any]]:
+        """Queue one item and wait for its result from the next flushed batch; None if the model dropped it"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._next_id += 1
+        self._pending.append((str(self._next_id), text, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush(client, model, timeout)
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_seconds, self._flush, client, model, timeout)
+
+        return await future
+
+    def _flush(self, client: openai.AsyncOpenAI, model: str, timeout: float) -> None:
+        """Detach the pending items and send them as one request"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._send(client, model, timeout, batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _send(
+        self,
+        client: openai.AsyncOpenAI,
+        model: str,
+        timeout: float,
+        batch: List[Tuple[str, str, asyncio.Future]]
+    ) -> None:
+        payload = json.dumps({"items": [{"id": item_id, "text": text} for item_id, text, _ in batch]})
+        try:
+            response = await client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": self.system_prompt},
+                    {"role": "user", "content": payload}
+                ],
+                response_format={"type": "json_object"},
+                timeout=timeout
+            )
+            results = {
+                str(item.get("id")): item
+                for item in json.loads(response.choices[0].message.content).get("results", [])
+                if isinstance(item, dict)
+            }
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        # Items the model dropped resolve to None so callers can tell them apart
+        for item_id, _, future in batch:
+            if not future.done():
+                future.set_result(results.get(item_id))
@@ -2,40 +2,68 @@
 Helper functions for accessing user AI settings
 """
 
+from io import StringIO
+
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import UserSettingsDB
 from typing import Optional, Dict, List
 
 
+# Defaults returned when a user has no stored settings
+_DEFAULT_DOMAIN = ("interfaces", "electrical")
+
+_DEFAULT_AI_SETTINGS = {
+    "domain_focus": list(_DEFAULT_DOMAIN),
+    "response_style": "detailed",
+    "analysis_depth": "standard",
+    "custom_system_prompt": "",
+    "relationship_prompt": "",
+    "impact_prompt": ""
+}
+
+# Prompt fragments for response style and analysis depth (leading newline included)
+_STYLE_INSTRUCTIONS = {
+    "brief": "\nProvide brief, concise responses with key points only.",
+    "standard": "\nProvide balanced responses with adequate detail.",
+    "detailed": "\nProvide comprehensive, detailed analysis.",
+    "technical": "\nProvide deep technical analysis with equations and specifications where applicable."
+}
+
+_DEPTH_INSTRUCTIONS = {
+    "shallow": "\nFocus only on direct, first-level impacts and relationships.",
+    "standard": "\nAnalyze 2-3 levels deep in dependency trees.",
+    "deep": "\nPerform exhaustive analysis across all dependency levels."
+}
+
+
 async def get_user_ai_settings(user_id: str, db: AsyncSession) -> Dict:
     """
     Get user's AI prompt settings for use in AI operations.
     Returns a dict with domain focus, prompts, and style preferences.
     """
-    result = await db.execute(
-        select(UserSettingsDB).where(UserSettingsDB.user_id == user_id)
-    )
-    settings_db = result.scalar_one_or_none()
+    # Select only the columns we need so the row is not hydrated into an ORM object
+    stmt = select(
+        UserSettingsDB.domain_focus,
+        UserSettingsDB.response_style,
+        UserSettingsDB.analysis_depth,
+        UserSettingsDB.custom_system_prompt,
+        UserSettingsDB.relationship_prompt,
+        UserSettingsDB.impact_prompt
+    ).where(UserSettingsDB.user_id == user_id)
+    row = (await db.execute(stmt)).first()
     
-    if not settings_db:
-        # Return defaults
-        return {
-            "domain_focus": ["interfaces", "electrical"],
-            "response_style": "detailed",
-            "analysis_depth": "standard",
-            "custom_system_prompt": "",
-            "relationship_prompt": "",
-            "impact_prompt": ""
-        }
+    if row is None:
+        # Return defaults, with a fresh domain_focus list so callers can mutate it safely
+        return {**_DEFAULT_AI_SETTINGS, "domain_focus": list(_DEFAULT_DOMAIN)}
     
     return {
-        "domain_focus": settings_db.domain_focus or ["interfaces", "electrical"],
-        "response_style": settings_db.response_style,
-        "analysis_depth": settings_db.analysis_depth,
-        "custom_system_prompt": settings_db.custom_system_prompt or "",
-        "relationship_prompt": settings_db.relationship_prompt or "",
-        "impact_prompt": settings_db.impact_prompt or ""
+        "domain_focus": list(row.domain_focus or _DEFAULT_DOMAIN),
+        "response_style": row.response_style,
+        "analysis_depth": row.analysis_depth,
+        "custom_system_prompt": row.custom_system_prompt or "",
+        "relationship_prompt": row.relationship_prompt or "",
+        "impact_prompt": row.impact_prompt or ""
     }
 
 
@@ -51,43 +79,38 @@ def build_system_prompt_with_settings(base_prompt: str, ai_settings: Dict, promp
     Returns:
         Complete system prompt string
     """
-    prompt_parts = [base_prompt]
+    buf = StringIO()
+    buf.write(base_prompt)
     
     # Add custom system prompt if provided
     if ai_settings["custom_system_prompt"]:
-        prompt_parts.append(f"\nUser preferences: {ai_settings['custom_system_prompt']}")
+        buf.write("\n\nUser preferences: ")
+        buf.write(ai_settings["custom_system_prompt"])
     
     # Add domain focus
     if ai_settings["domain_focus"]:
-        domains = ", ".join(ai_settings["domain_focus"])
-        prompt_parts.append(f"\nPrioritize these engineering domains: {domains}")
-    
-    # Add response style
-    style_instructions = {
-        "brief": "Provide brief, concise responses with key points only.",
-        "standard": "Provide balanced responses with adequate detail.",
-        "detailed": "Provide comprehensive, detailed analysis.",
-        "technical": "Provide deep technical analysis with equations and specifications where applicable."
-    }
-    if ai_settings["response_style"] in style_instructions:
-        prompt_parts.append(f"\n{style_instructions[ai_settings['response_style']]}")
+        buf.write("\n\nPrioritize these engineering domains: ")
+        buf.write(", ".join(ai_settings["domain_focus"]))
     
-    # Add analysis depth
-    depth_instructions = {
-        "shallow": "Focus only on direct, first-level impacts and relationships.",
-        "standard": "Analyze 2-3 levels deep in dependency trees.",
-        "deep": "Perform exhaustive analysis across all dependency levels."
-    }
-    if ai_settings["analysis_depth"] in depth_instructions:
-        prompt_parts.append(f"\n{depth_instructions[ai_settings['analysis_depth']]}")
+    # Add response style and analysis depth
+    style = _STYLE_INSTRUCTIONS.get(ai_settings["response_style"])
+    if style:
+        buf.write("\n")
+        buf.write(style)
+    depth = _DEPTH_INSTRUCTIONS.get(ai_settings["analysis_depth"])
+    if depth:
+        buf.write("\n")
+        buf.write(depth)
     
     # Add type-specific prompt
     if prompt_type == "relationship" and ai_settings["relationship_prompt"]:
-        prompt_parts.append(f"\nRelationship analysis guidance: {ai_settings['relationship_prompt']}")
+        buf.write("\n\nRelationship analysis guidance: ")
+        buf.write(ai_settings["relationship_prompt"])
     elif prompt_type == "impact" and ai_settings["impact_prompt"]:
-        prompt_parts.append(f"\nImpact analysis guidance: {ai_settings['impact_prompt']}")
+        buf.write("\n\nImpact analysis guidance: ")
+        buf.write(ai_settings["impact_prompt"])
     
-    return "\n".join(prompt_parts)
+    return buf.getvalue()
 
 
 # Example usage in an AI router:
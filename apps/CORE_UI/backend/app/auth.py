@@ -3,42 +3,155 @@ Authentication utilities for CORE-SE Backend
 """
 
 import jwt
+import os
+import bcrypt
 import uuid
+import asyncio
+import base64
 import hashlib
+import hmac
+import json
+import time
+from calendar import timegm
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from operator import itemgetter
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Dict, Optional
+from argon2 import PasswordHasher, Type
+from argon2.exceptions import InvalidHashError, VerificationError
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
 from .config import get_settings
-from .models import TokenData, UserRole
+from .models import TokenData, UserRole, ROLE_LEVELS
 
-# Password context for hashing
+# Password context, only used to verify legacy hashes that are neither Argon2 nor bcrypt
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Worker pool for password hashing; the KDF is CPU-bound and would otherwise block the event loop
+_HASH_POOL = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="pwhash")
+
+# Hash prefixes of legacy bcrypt hashes, still accepted on verify
+_BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+
 # Get settings
 settings = get_settings()
 
+# New passwords are hashed with Argon2id
+_password_hasher = PasswordHasher(
+    time_cost=settings.ARGON2_TIME_COST,
+    memory_cost=settings.ARGON2_MEMORY_COST,
+    parallelism=settings.ARGON2_PARALLELISM,
+    type=Type.ID
+)
+
+_UTC = timezone.utc
+
+# JTIs of revoked tokens mapped to the token's own expiry (epoch seconds); an
+# entry is only needed until then, and expired entries are pruned when full
+_REVOKED: Dict[str, float] = {}
+_REVOKED_MAX_SIZE = 100_000
+
+# Verified tokens, keyed by a short digest of the token string; a hit skips
+# signature verification and claim parsing. Oldest entries are evicted first.
+_TOKEN_CACHE: "OrderedDict[bytes, TokenData]" = OrderedDict()
+_TOKEN_CACHE_MAX_SIZE = 10_000
+
+# User fields copied into token responses, extracted in a single call
+_USER_RESPONSE_KEYS = ("id", "email", "username", "full_name", "role", "is_active", "created_at")
+_get_user_response_values = itemgetter(*_USER_RESPONSE_KEYS)
+
+# Use JWT secret key or fallback to demo token for development
+_SECRET_KEY = settings.JWT_SECRET_KEY or settings.DEMO_AUTH_TOKEN
+
+# HS256 tokens are signed with an HMAC keyed once at import; each token copies
+# the keyed state instead of re-deriving it from the secret
+_USE_HS256 = settings.JWT_ALGORITHM == "HS256"
+_HMAC_KEY = hmac.new(_SECRET_KEY.encode("utf-8"), digestmod=hashlib.sha256)
+
+
+def _b64url_encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64url_decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+_HS256_HEADER = _b64url_encode(b'{"alg":"HS256","typ":"JWT"}')
+
+
+def _sign_hs256(signing_input: bytes) -> bytes:
+    """HMAC-SHA256 signature using the precomputed key"""
+    mac = _HMAC_KEY.copy()
+    mac.update(signing_input)
+    return mac.digest()
+
+
+def _encode_hs256(payload: dict) -> str:
+    """Encode and sign an HS256 JWT"""
+    claims = dict(payload)
+    if isinstance(claims.get("exp"), datetime):
+        claims["exp"] = timegm(claims["exp"].utctimetuple())
+    payload_segment = _b64url_encode(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+    signing_input = _HS256_HEADER + b"." + payload_segment
+    return (signing_input + b"." + _b64url_encode(_sign_hs256(signing_input))).decode("ascii")
+
+
+def _verify_hs256(token: str) -> dict:
+    """Verify an HS256 JWT signature and return its claims"""
+    try:
+        signing_input, signature_segment = token.encode("ascii").rsplit(b".", 1)
+        header_segment, payload_segment = signing_input.split(b".", 1)
+        header = json.loads(_b64url_decode(header_segment))
+        payload = json.loads(_b64url_decode(payload_segment))
+        signature = _b64url_decode(signature_segment)
+    except ValueError:
+        raise jwt.DecodeError("Invalid token")
+    
+    if not isinstance(header, dict) or header.get("alg") != "HS256":
+        raise jwt.InvalidAlgorithmError("The specified alg value is not allowed")
+    if not hmac.compare_digest(signature, _sign_hs256(signing_input)):
+        raise jwt.InvalidSignatureError("Signature verification failed")
+    if not isinstance(payload, dict):
+        raise jwt.DecodeError("Invalid payload")
+    if "exp" in payload and not isinstance(payload["exp"], (int, float)):
+        raise jwt.DecodeError("Expiration Time claim (exp) must be an integer.")
+    return payload
+
 
 def hash_password(password: str) -> str:
-    """Hash a password using bcrypt (with SHA256 pre-hash for long passwords)"""
-    # bcrypt has a 72-byte limit, so pre-hash long passwords with SHA256
-    password_bytes = password.encode('utf-8')
-    if len(password_bytes) > 72:
-        print(f"[DEBUG] Password too long ({len(password_bytes)} bytes), pre-hashing with SHA256")
-        password = hashlib.sha256(password_bytes).hexdigest()
-    else:
-        print(f"[DEBUG] Password length OK ({len(password_bytes)} bytes)")
-    return pwd_context.hash(password)
+    """Hash a password using Argon2id"""
+    return _password_hasher.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against its hash"""
-    # Apply same pre-hash logic as hash_password for long passwords
+    if hashed_password.startswith("$argon2"):
+        try:
+            return _password_hasher.verify(hashed_password, plain_password)
+        except (VerificationError, InvalidHashError):
+            return False
+    # Legacy bcrypt hashes pre-hashed long passwords with SHA256 (72-byte limit)
     if len(plain_password.encode('utf-8')) > 72:
         plain_password = hashlib.sha256(plain_password.encode('utf-8')).hexdigest()
+    if hashed_password.startswith(_BCRYPT_PREFIXES):
+        return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
     return pwd_context.verify(plain_password, hashed_password)
 
 
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the hashing thread pool so the event loop stays free"""
+    return await asyncio.get_running_loop().run_in_executor(_HASH_POOL, hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the hashing thread pool so the event loop stays free"""
+    return await asyncio.get_running_loop().run_in_executor(
+        _HASH_POOL, verify_password, plain_password, hashed_password
+    )
+
+
 def generate_user_id() -> str:
     """Generate a unique user ID"""
     return str(uuid.uuid4())
@@ -48,20 +161,59 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     """Create a JWT access token"""
     to_encode = data.copy()
     
-    if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
-    else:
-        expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    expire = datetime.now(_UTC) + (expires_delta or settings.access_token_expires_td)
     
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     
-    # Use JWT secret key or fallback to demo token for development
-    secret_key = settings.JWT_SECRET_KEY or settings.DEMO_AUTH_TOKEN
+    if _USE_HS256:
+        return _encode_hs256(to_encode)
     
-    encoded_jwt = jwt.encode(to_encode, secret_key, algorithm=settings.JWT_ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
     return encoded_jwt
 
 
+def _decode(token: str) -> dict:
+    """Decode and verify a JWT signature"""
+    if _USE_HS256:
+        return _verify_hs256(token)
+    return jwt.decode(token, _SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+
+
+def _peek_claims(token: str) -> dict:
+    """Read the claims without verifying the signature; empty if unreadable"""
+    try:
+        payload = json.loads(_b64url_decode(token.split(".", 2)[1].encode("ascii")))
+    except (ValueError, IndexError):
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
+def _peek_jti(token: str) -> Optional[str]:
+    """Read the jti claim without verifying the signature"""
+    jti = _peek_claims(token).get("jti")
+    # The payload is unverified; anything but a string cannot be a jti we issued
+    return jti if isinstance(jti, str) else None
+
+
+def revoke(jti: str, exp: Optional[float] = None) -> None:
+    """Reject any further use of the token with this jti until it expires at exp (never, if None)"""
+    if len(_REVOKED) >= _REVOKED_MAX_SIZE:
+        now = time.time()
+        for expired in [key for key, until in _REVOKED.items() if until <= now]:
+            del _REVOKED[expired]
+        if len(_REVOKED) >= _REVOKED_MAX_SIZE:
+            del _REVOKED[next(iter(_REVOKED))]
+    _REVOKED[jti] = float("inf") if exp is None else exp
+
+
+def revoke_token(token: str) -> None:
+    """Revoke a token by its jti claim, if it has one, for as long as the token is valid"""
+    claims = _peek_claims(token)
+    jti, exp = claims.get("jti"), claims.get("exp")
+    if jti and isinstance(jti, str):
+        revoke(jti, exp if isinstance(exp, (int, float)) else None)
+
+
 def verify_token(token: str) -> TokenData:
     """Verify and decode a JWT token"""
     credentials_exception = HTTPException(
@@ -70,26 +222,45 @@ def verify_token(token: str) -> TokenData:
         headers={"WWW-Authenticate": "Bearer"},
     )
     
+    # Revoked tokens are rejected before any signature work
+    if _REVOKED and _peek_jti(token) in _REVOKED:
+        raise credentials_exception
+    
+    # Cached tokens were verified already; only expiry can have changed
+    cache_key = hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+    cached = _TOKEN_CACHE.get(cache_key)
+    if cached is not None:
+        if cached.exp is not None and cached.exp <= time.time():
+            del _TOKEN_CACHE[cache_key]
+            raise credentials_exception
+        _TOKEN_CACHE.move_to_end(cache_key)
+        return cached
+    
     try:
-        # Use JWT secret key or fallback to demo token for development
-        secret_key = settings.JWT_SECRET_KEY or settings.DEMO_AUTH_TOKEN
-        
-        payload = jwt.decode(token, secret_key, algorithms=[settings.JWT_ALGORITHM])
+        payload = _decode(token)
         username: str = payload.get("sub")
         user_id: str = payload.get("user_id")
         role: str = payload.get("role")
         exp: int = payload.get("exp")
         
-        if username is None or user_id is None:
+        # Evaluate every claim check before branching so a malformed token
+        # takes the same path as an expired one
+        claims_missing = (username is None) | (user_id is None)
+        expired = exp is not None and exp <= time.time()
+        if claims_missing | expired:
             raise credentials_exception
             
         token_data = TokenData(
             username=username,
             user_id=user_id,
-            role=UserRole(role) if role else None,
+            role=role or None,
             exp=exp
         )
         
+        _TOKEN_CACHE[cache_key] = token_data
+        if len(_TOKEN_CACHE) > _TOKEN_CACHE_MAX_SIZE:
+            _TOKEN_CACHE.popitem(last=False)
+        
         return token_data
         
     except jwt.PyJWTError:
@@ -98,8 +269,6 @@ def verify_token(token: str) -> TokenData:
 
 def create_token_response(user_data: dict) -> dict:
     """Create a complete token response"""
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    
     token_data = {
         "sub": user_data["username"],
         "user_id": user_data["id"],
@@ -108,35 +277,23 @@ def create_token_response(user_data: dict) -> dict:
     
     access_token = create_access_token(
         data=token_data, 
-        expires_delta=access_token_expires
+        expires_delta=settings.access_token_expires_td
     )
     
+    user = dict(zip(_USER_RESPONSE_KEYS, _get_user_response_values(user_data)))
+    user["last_login"] = user_data.get("last_login")
+    
     return {
         "access_token": access_token,
         "token_type": "bearer",
-        "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,  # Convert to seconds
-        "user": {
-            "id": user_data["id"],
-            "email": user_data["email"],
-            "username": user_data["username"],
-            "full_name": user_data["full_name"],
-            "role": user_data["role"],
-            "is_active": user_data["is_active"],
-            "created_at": user_data["created_at"],
-            "last_login": user_data.get("last_login")
-        }
+        "expires_in": settings.access_token_expires_seconds,
+        "user": user
     }
 
 
 def check_role_permission(user_role: UserRole, required_role: UserRole) -> bool:
     """Check if user role has permission for required role"""
-    role_hierarchy = {
-        UserRole.CONSUMER: 1,
-        UserRole.INFLUENCER: 2,
-        UserRole.ADMIN: 3
-    }
-    
-    return role_hierarchy.get(user_role, 0) >= role_hierarchy.get(required_role, 0)
+    return ROLE_LEVELS[user_role] >= ROLE_LEVELS[required_role]
 
 
 def require_role(required_role: UserRole):
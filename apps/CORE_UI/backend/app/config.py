@@ -2,15 +2,22 @@
 Configuration settings for CORE-SE Demo Backend
 """
 
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional, List
-from functools import lru_cache
+from functools import lru_cache, cached_property
+from datetime import timedelta
 from pathlib import Path
 
 
 class Settings(BaseSettings):
     """Application settings"""
 
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        case_sensitive=True,
+        extra="ignore",  # Ignore extra fields
+    )
+
     # App mode
     MODE: str = "demo"  # demo | web | desktop
 
@@ -30,6 +37,10 @@ class Settings(BaseSettings):
     JWT_SECRET_KEY: Optional[str] = None
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Argon2id cost: 3 passes over 64 MiB with 4 lanes
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536
+    ARGON2_PARALLELISM: int = 4
     
     # Feature flags
     FEATURE_EMAIL: bool = True
@@ -42,6 +53,9 @@ class Settings(BaseSettings):
     # AI settings
     OPENAI_MODEL: str = "gpt-4o-mini"
     AI_TIMEOUT: int = 30
+    FEATURE_AI_BATCHING: bool = False  # Coalesce concurrent summarize/bullets calls
+    AI_BATCH_WINDOW_MS: int = 250
+    AI_BATCH_MAX_SIZE: int = 8
     MODEL: Optional[str] = None  # For backward compatibility
     VITE_MODEL: Optional[str] = None
     VITE_OPENAI_API_KEY: Optional[str] = None
@@ -63,11 +77,6 @@ class Settings(BaseSettings):
         "tauri://localhost",
     ]
 
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
-        extra = "ignore"  # Ignore extra fields
-
     def resolve_database_url(self) -> str:
         """Resolve database URL based on mode and provided settings."""
         if self.DATABASE_URL:
@@ -87,12 +96,22 @@ class Settings(BaseSettings):
             return None
         return self.FDS_BASE_URL
 
+    @cached_property
+    def access_token_expires_td(self) -> timedelta:
+        """Access token lifetime as a timedelta"""
+        return timedelta(minutes=self.ACCESS_TOKEN_EXPIRE_MINUTES)
+
+    @cached_property
+    def access_token_expires_seconds(self) -> int:
+        """Access token lifetime in seconds"""
+        return self.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
     def resolved_settings(self) -> "Settings":
         """Return a new Settings object with derived values applied."""
-        data = self.dict()
-        data["DATABASE_URL"] = self.resolve_database_url()
-        data["FDS_BASE_URL"] = self.resolve_fds_base_url()
-        return Settings(**data)
+        return self.model_copy(update={
+            "DATABASE_URL": self.resolve_database_url(),
+            "FDS_BASE_URL": self.resolve_fds_base_url(),
+        })
 
 
 @lru_cache()
@@ -2,16 +2,21 @@
 Database setup and SQLAlchemy models for CORE-SE Demo
 """
 
-from sqlalchemy import Column, String, Text, DateTime, JSON, Integer, Boolean, Float, ForeignKey, create_engine
+from sqlalchemy import Column, String, Text, DateTime, JSON, Integer, Boolean, Float, ForeignKey, Index, create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session, relationship
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from datetime import datetime
+import logging
 import uuid
 import json
 
 from app.config import get_settings
 
+logger = logging.getLogger(__name__)
+
 Base = declarative_base()
 
 class TaskDB(Base):
@@ -21,14 +26,47 @@ class TaskDB(Base):
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     title = Column(String, nullable=False)
     description = Column(Text)
-    status = Column(String, default="open")
+    status = Column(String, default="open", index=True)
     priority = Column(String, default="medium")
-    assignee = Column(String)
+    assignee = Column(String, index=True)
     due_date = Column(DateTime)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     context_artifacts = Column(JSON, default=list)
-    subtasks = Column(JSON, default=list)
+    subtasks = Column(JSON, default=list)  # Legacy storage, kept in sync with subtask_rows
+
+    subtask_rows = relationship(
+        "TaskSubtaskDB",
+        order_by="TaskSubtaskDB.position",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="selectin",
+    )
+
+    @property
+    def subtask_list(self) -> list:
+        """Subtasks from the child table, falling back to the legacy JSON column"""
+        if self.subtask_rows:
+            return [row.text for row in self.subtask_rows]
+        return self.subtasks or []
+
+    def set_subtasks(self, subtasks: list) -> None:
+        """Replace the subtasks, writing both the child rows and the legacy column"""
+        self.subtask_rows = [
+            TaskSubtaskDB(position=position, text=text)
+            for position, text in enumerate(subtasks)
+        ]
+        self.subtasks = list(subtasks)
+
+
+class TaskSubtaskDB(Base):
+    """SQLAlchemy model for task subtasks"""
+    __tablename__ = "task_subtasks"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    task_id = Column(String, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False, index=True)
+    position = Column(Integer, nullable=False, default=0)
+    text = Column(Text, nullable=False)
 
 
 class NoteDB(Base):
@@ -43,6 +81,11 @@ class NoteDB(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     author = Column(String)
+    
+    # Notes are listed newest-first
+    __table_args__ = (
+        Index("ix_notes_updated_at", updated_at.desc()),
+    )
 
 
 class RequirementDocumentDB(Base):
@@ -63,7 +106,7 @@ class RequirementDocumentDB(Base):
     classification = Column(String)  # 'unclassified', 'restricted', etc.
     
     # Processing status
-    processing_status = Column(String, default="pending")  # pending, processing, completed, failed
+    processing_status = Column(String, default="pending", index=True)  # pending, processing, completed, failed
     extraction_status = Column(String, default="not_started")  # not_started, in_progress, completed, failed
     requirements_extracted = Column(Integer, default=0)
     
@@ -121,11 +164,14 @@ class UserSettingsDB(Base):
 class RequirementDB(Base):
     """SQLAlchemy model for extracted requirements"""
     __tablename__ = "requirements"
+    __table_args__ = (
+        Index("ix_req_doc_status", "document_id", "status"),
+    )
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     
     # Link to source document
-    document_id = Column(String, ForeignKey("requirement_documents.id"), nullable=False)
+    document_id = Column(String, ForeignKey("requirement_documents.id"), nullable=False, index=True)
     document = relationship("RequirementDocumentDB", back_populates="requirements")
     
     # Requirement identification
@@ -150,7 +196,7 @@ class RequirementDB(Base):
     extraction_confidence = Column(Float, default=1.0)  # 0.0 - 1.0
     
     # Status
-    status = Column(String, default="active")  # active, deprecated, superseded
+    status = Column(String, default="active", index=True)  # active, deprecated, superseded
     
     # Timestamps
     extracted_at = Column(DateTime, default=datetime.utcnow)
@@ -164,29 +210,108 @@ class RequirementDB(Base):
 
 
 # Database setup
-settings = get_settings()
+# Keep connections alive between requests instead of reopening per session
+ENGINE_POOL_OPTIONS = {
+    "pool_size": 20,
+    "max_overflow": 10,
+    "pool_pre_ping": True,
+    "pool_recycle": 3600,
+}
 
-if settings.DATABASE_URL.startswith("sqlite"):
-    # Use aiosqlite for async SQLite
-    async_database_url = settings.DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://")
-    engine = create_async_engine(async_database_url, echo=False)
-else:
-    engine = create_async_engine(settings.DATABASE_URL, echo=False)
+# SQLite connections are local files: keep a smaller persistent pool and skip
+# the liveness ping. Pragmas are applied once per pooled connection on connect,
+# so WAL mode survives between checkouts.
+SQLITE_POOL_OPTIONS = {
+    **ENGINE_POOL_OPTIONS,
+    "poolclass": AsyncAdaptedQueuePool,
+    "pool_size": 10,
+    "pool_pre_ping": False,
+}
 
-AsyncSessionLocal = async_sessionmaker(
-    engine, class_=AsyncSession, expire_on_commit=False
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA foreign_keys=ON",
 )
 
+POSTGRES_SESSION_SETUP = (
+    "SET timezone='UTC'",
+    "SET statement_timeout='30s'",
+)
+
+
+def _run_on_connect(statements):
+    """Build a connect hook that runs the given statements once per new connection"""
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+    return on_connect
+
+
+# Engine and session factory are created on first use so importing this module
+# does not resolve settings or touch the filesystem
+_engine = None
+_sessionmaker = None
+
+
+def get_engine():
+    """Get the shared async engine, creating it on first use"""
+    global _engine
+    if _engine is None:
+        settings = get_settings()
+        if settings.DATABASE_URL.startswith("sqlite"):
+            # Use aiosqlite for async SQLite
+            async_database_url = settings.DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://")
+            _engine = create_async_engine(async_database_url, echo=False, **SQLITE_POOL_OPTIONS)
+            event.listen(_engine.sync_engine, "connect", _run_on_connect(SQLITE_PRAGMAS))
+        else:
+            _engine = create_async_engine(settings.DATABASE_URL, echo=False, **ENGINE_POOL_OPTIONS)
+            if _engine.dialect.name == "postgresql":
+                event.listen(_engine.sync_engine, "connect", _run_on_connect(POSTGRES_SESSION_SETUP))
+    return _engine
+
+
+def get_sessionmaker():
+    """Get the shared session factory bound to the engine"""
+    global _sessionmaker
+    if _sessionmaker is None:
+        _sessionmaker = async_sessionmaker(
+            get_engine(), class_=AsyncSession, expire_on_commit=False
+        )
+    return _sessionmaker
+
+
+def _create_missing_indexes(sync_conn):
+    """Add indexes declared on tables that already existed before they were introduced.
+
+    An index whose columns an older table lacks is skipped with a warning
+    rather than failing startup.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                with sync_conn.begin_nested():
+                    index.create(sync_conn, checkfirst=True)
+            except OperationalError as e:
+                logger.warning(f"Could not create index {index.name}: {e}")
+
 
 async def init_db():
     """Initialize database tables"""
-    async with engine.begin() as conn:
+    async with get_engine().begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_create_missing_indexes)
 
 
 async def get_db() -> AsyncSession:
     """Get database session"""
-    async with AsyncSessionLocal() as session:
+    async with get_sessionmaker()() as session:
         try:
             yield session
         finally:
@@ -2,19 +2,37 @@
 FastAPI dependencies for authentication and authorization
 """
 
-from fastapi import Depends, HTTPException, status
+import httpx
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from typing import Optional
-from .database import get_db
+from typing import Annotated, Optional
+from .config import Settings, get_settings
 from .auth import verify_token, check_role_permission
-from .models import TokenData, UserRole, User
+from .models import TokenData, UserRole, User, ROLE_LEVELS
+
+# Application settings, injected per request (get_settings is cached)
+SettingsDep = Annotated[Settings, Depends(get_settings)]
+
+# Dependencies are async so FastAPI runs them on the event loop instead of
+# handing each one to the threadpool; none of them block
 
 # HTTP Bearer token scheme
 security = HTTPBearer()
 
+# Demo user index, bound on first use to avoid a circular import with the auth router
+_demo_users_by_id: Optional[dict] = None
+
+
+def _get_demo_users_by_id() -> dict:
+    """Return the demo user store indexed by user ID"""
+    global _demo_users_by_id
+    if _demo_users_by_id is None:
+        from .routers.auth import demo_users_by_id
+        _demo_users_by_id = demo_users_by_id
+    return _demo_users_by_id
 
-def get_current_user_token(
+
+async def get_current_user_token(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> TokenData:
     """Extract and verify JWT token from Authorization header"""
@@ -22,18 +40,13 @@ def get_current_user_token(
     return verify_token(token)
 
 
-def get_current_user(
-    token_data: TokenData = Depends(get_current_user_token),
-    db: Session = Depends(get_db)
+async def get_current_user(
+    token_data: TokenData = Depends(get_current_user_token)
 ) -> dict:
     """Get current user from database using token data"""
-    # Import here to avoid circular imports
-    from .routers.auth import demo_users
-    
-    # Find user in demo_users store
-    for user in demo_users.values():
-        if user["id"] == token_data.user_id:
-            return user
+    user = _get_demo_users_by_id().get(token_data.user_id)
+    if user is not None:
+        return user
     
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
@@ -41,7 +54,7 @@ def get_current_user(
     )
 
 
-def get_current_active_user(
+async def get_current_active_user(
     current_user: dict = Depends(get_current_user)
 ) -> dict:
     """Ensure current user is active"""
@@ -55,28 +68,23 @@ def get_current_active_user(
 
 def require_role(required_role: UserRole):
     """Dependency factory for role-based access control"""
-    def role_checker(current_user: dict = Depends(get_current_active_user)) -> dict:
-        user_role = UserRole(current_user["role"])
-        if not check_role_permission(user_role, required_role):
+    async def role_checker(current_user: dict = Depends(get_current_active_user)) -> dict:
+        user_role = current_user["role"]
+        if user_role not in ROLE_LEVELS or not check_role_permission(user_role, required_role):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Access denied. Required role: {required_role.value}"
+                detail=f"Access denied. Required role: {required_role}"
             )
         return current_user
     return role_checker
 
 
-def require_admin(current_user: dict = Depends(get_current_active_user)) -> dict:
-    """Require admin role"""
-    return require_role(UserRole.ADMIN)(current_user)
-
+# Role checkers are built once at import and used directly as dependencies
+require_admin = require_role("admin")
+require_influencer_or_admin = require_role("influencer")
 
-def require_influencer_or_admin(current_user: dict = Depends(get_current_active_user)) -> dict:
-    """Require influencer or admin role"""
-    return require_role(UserRole.INFLUENCER)(current_user)
 
-
-def get_optional_user(
+async def get_optional_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False))
 ) -> Optional[dict]:
     """Get current user if token is provided, otherwise return None"""
@@ -85,15 +93,22 @@ def get_optional_user(
     
     try:
         token_data = verify_token(credentials.credentials)
-        # Import here to avoid circular imports
-        from .routers.auth import demo_users
-        
-        # Find user in demo_users store
-        for user in demo_users.values():
-            if user["id"] == token_data.user_id:
-                return user
-        
+        return _get_demo_users_by_id().get(token_data.user_id)
     except HTTPException:
         pass
     
     return None
+
+
+async def get_http_client(request: Request) -> httpx.AsyncClient:
+    """Shared FDS HTTP client created in the app lifespan"""
+    return request.app.state.http
+
+
+async def require_ai_feature(settings: SettingsDep) -> None:
+    """Reject AI requests while the AI microcalls feature flag is off"""
+    if not settings.FEATURE_AI_MICROCALLS:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="AI microcalls feature is disabled"
+        )
@@ -2,33 +2,69 @@
 Pydantic models for CORE-SE Demo API
 """
 
-from pydantic import BaseModel, Field, EmailStr
-from typing import List, Optional, Dict, Any, Literal
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field, StringConstraints, TypeAdapter, computed_field, model_serializer, model_validator
+from typing import Annotated, List, Optional, Dict, Any, Literal, Tuple, Union
+from dataclasses import dataclass
 from datetime import datetime
-from enum import Enum
+from functools import lru_cache
+import sys
 
+# Core schemas are built on first use rather than at import
+_DEFER = ConfigDict(defer_build=True)
 
-class UserRole(str, Enum):
-    """User roles in the system"""
-    CONSUMER = "consumer"
-    INFLUENCER = "influencer"
-    ADMIN = "admin"
+# Immutable DTOs: never mutated after construction, and hashable as a result
+_FROZEN = ConfigDict(defer_build=True, frozen=True)
 
+# Email addresses are checked with a regex in pydantic-core; full RFC validation
+# only happens at signup (see routers/auth.py)
+EMAIL_RE = r"^[^@\s]+@[^@\s]+\.[^@\s]+$"
+Email = Annotated[str, StringConstraints(pattern=EMAIL_RE, max_length=254, to_lower=True)]
 
-class ArtifactType(str, Enum):
-    """Types of artifacts in the system"""
-    REQUIREMENT = "requirement"
-    TEST = "test"
-    ISSUE = "issue"
-    PART = "part"
-    ECN = "ecn"
-    EMAIL = "email"
-    OUTLOOK = "outlook"
-    BOM = "bom"
+# Upper bound for free-text inputs sent to the AI endpoints or stored as notes;
+# oversized bodies are rejected by pydantic-core before any Python runs
+AI_TEXT_MAX_LENGTH = 200_000
+AIText = Annotated[str, StringConstraints(max_length=AI_TEXT_MAX_LENGTH)]
+
+# Short, frequently repeated string lists (tags, interests, subtasks) are kept
+# as tuples of interned strings so equal values share one object
+Tags = Annotated[Tuple[str, ...], AfterValidator(lambda values: tuple(map(sys.intern, values)))]
+
+# Free-form metadata/context values; scalar (or string list) values keep
+# validation on pydantic-core's typed paths instead of the generic Any path
+MetadataValue = Union[str, int, float, bool, List[str], None]
+MetadataDict = Dict[str, MetadataValue]
+
+# Field descriptors shared by every model with the same field shape; pydantic
+# copies them per field, so one instance can back any number of declarations
+_LIST = Field(default_factory=list)
+_TUPLE = Field(default_factory=tuple)
+_CREATED_AT = Field(None, description="Creation timestamp")
+_UPDATED_AT = Field(None, description="Last update timestamp")
+
+# Scores and percentages are carried as integer basis points (10000 = 1.0 / 100%)
+BasisPoints = Annotated[int, Field(ge=0, le=10000)]
+# Additive scores such as search relevance are not capped at 1.0
+ScoreBasisPoints = Annotated[int, Field(ge=0)]
+
+
+# User roles in the system
+UserRole = Literal["consumer", "influencer", "admin"]
+
+# Rank of each role in the permission hierarchy
+ROLE_LEVELS = {
+    "consumer": 1,
+    "influencer": 2,
+    "admin": 3
+}
+
+# Types of artifacts in the system
+ArtifactType = Literal["requirement", "test", "issue", "part", "ecn", "email", "outlook", "bom"]
 
 
 class ArtifactRef(BaseModel):
     """Reference to an artifact from external systems"""
+    model_config = _FROZEN
+    
     id: str = Field(..., description="Artifact ID (e.g., JAMA-REQ-123)")
     type: ArtifactType = Field(..., description="Type of artifact")
     source: str = Field(..., description="Source system (jama, jira, windchill, outlook, email)")
@@ -37,19 +73,51 @@ class ArtifactRef(BaseModel):
     url: Optional[str] = Field(None, description="Link to source")
 
 
+@lru_cache(maxsize=65536)
+def artifact_ref(
+    id: str,
+    type: ArtifactType,
+    source: str,
+    title: str,
+    status: Optional[str] = None,
+    url: Optional[str] = None
+) -> ArtifactRef:
+    """Get the shared ArtifactRef for internally produced artifact data.
+
+    ArtifactRef is frozen, so one instance per distinct artifact can be
+    reused across feeds, tasks and knowledge cards. Inputs are trusted and
+    not validated.
+    """
+    return ArtifactRef.model_construct(
+        id=id, type=type, source=source, title=title, status=status, url=url
+    )
+
+
+# Shared adapter for validating/dumping bare artifact lists (task context, note citations)
+ARTIFACT_LIST_ADAPTER = TypeAdapter(List[ArtifactRef], config=_DEFER)
+
+
 class PulseItem(BaseModel):
     """Item in the pulse feed"""
+    model_config = _DEFER
+    
     id: str = Field(..., description="Unique pulse item ID")
     artifact_ref: ArtifactRef = Field(..., description="Referenced artifact")
     change_type: str = Field(..., description="Type of change (created, updated, deleted)")
     change_summary: str = Field(..., description="Human-readable change description")
     timestamp: datetime = Field(..., description="When the change occurred")
     author: Optional[str] = Field(None, description="Who made the change")
-    metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional metadata")
+    metadata: MetadataDict = Field(default_factory=dict, description="Additional metadata")
+
+
+# Feed list responses are encoded straight to JSON bytes in one pydantic-core pass
+PULSE_ITEM_LIST_ADAPTER = TypeAdapter(List[PulseItem], config=_DEFER)
 
 
 class ImpactNode(BaseModel):
     """Node in an impact analysis tree"""
+    model_config = _DEFER
+    
     artifact_ref: ArtifactRef = Field(..., description="The artifact")
     impact_level: int = Field(..., description="Degree of separation from root")
     relationship_type: str = Field(..., description="Type of relationship (depends_on, tests, implements)")
@@ -58,6 +126,8 @@ class ImpactNode(BaseModel):
 
 class ImpactResult(BaseModel):
     """Result of impact analysis"""
+    model_config = _DEFER
+    
     root_artifact: ArtifactRef = Field(..., description="Root artifact being analyzed")
     depth: int = Field(..., description="Analysis depth")
     total_impacted: int = Field(..., description="Total number of impacted items")
@@ -65,85 +135,156 @@ class ImpactResult(BaseModel):
     gap_count: int = Field(0, description="Number of traceability gaps found")
 
 
-class TaskStatus(str, Enum):
-    """Task status enumeration"""
-    OPEN = "open"
-    IN_PROGRESS = "in_progress"
-    BLOCKED = "blocked"
-    COMPLETED = "completed"
-    CANCELLED = "cancelled"
+# Typed view of an FDS impact tree, only built when the column layout needs it
+IMPACT_TREE_ADAPTER = TypeAdapter(List[ImpactNode], config=_DEFER)
+
+
+class ImpactLevelArray(BaseModel):
+    """Impact tree flattened into parallel columns, one entry per node in pre-order.
+
+    parent_idx points at the parent's position (-1 for top-level nodes), which
+    is enough for a client to reassemble the tree.
+    """
+    model_config = _DEFER
+    
+    ids: List[str] = Field(default_factory=list, description="Artifact IDs")
+    types: List[ArtifactType] = Field(default_factory=list, description="Artifact types")
+    sources: List[str] = Field(default_factory=list, description="Artifact source systems")
+    titles: List[str] = Field(default_factory=list, description="Artifact titles")
+    levels: List[int] = Field(default_factory=list, description="Degree of separation from root")
+    rels: List[str] = Field(default_factory=list, description="Relationship types")
+    parent_idx: List[int] = Field(default_factory=list, description="Index of each node's parent, -1 at top level")
+
+    @classmethod
+    def from_tree(cls, nodes: List[ImpactNode]) -> "ImpactLevelArray":
+        """Flatten an impact tree without recursion"""
+        columns = cls()
+        stack = [(node, -1) for node in reversed(nodes)]
+        while stack:
+            node, parent = stack.pop()
+            index = len(columns.ids)
+            ref = node.artifact_ref
+            columns.ids.append(ref.id)
+            columns.types.append(ref.type)
+            columns.sources.append(ref.source)
+            columns.titles.append(ref.title)
+            columns.levels.append(node.impact_level)
+            columns.rels.append(node.relationship_type)
+            columns.parent_idx.append(parent)
+            stack.extend((child, index) for child in reversed(node.children))
+        return columns
+
+
+class ImpactColumnsResult(BaseModel):
+    """Result of impact analysis with the tree in column layout"""
+    model_config = _DEFER
+    
+    root_artifact: ArtifactRef = Field(..., description="Root artifact being analyzed")
+    depth: int = Field(..., description="Analysis depth")
+    total_impacted: int = Field(..., description="Total number of impacted items")
+    impact_columns: ImpactLevelArray = Field(..., description="Impact tree in column layout")
+    gap_count: int = Field(0, description="Number of traceability gaps found")
+
+
+# Task status values
+TaskStatus = Literal["open", "in_progress", "blocked", "completed", "cancelled"]
 
 
 class Task(BaseModel):
     """Task/work item"""
+    model_config = _DEFER
+    
     id: Optional[str] = Field(None, description="Task ID (auto-generated)")
     title: str = Field(..., description="Task title")
     description: Optional[str] = Field(None, description="Detailed description")
-    status: TaskStatus = Field(TaskStatus.OPEN, description="Current status")
+    status: TaskStatus = Field("open", description="Current status")
     priority: str = Field("medium", description="Priority level")
     assignee: Optional[str] = Field(None, description="Assigned user")
     due_date: Optional[datetime] = Field(None, description="Due date")
-    created_at: Optional[datetime] = Field(None, description="Creation timestamp")
-    updated_at: Optional[datetime] = Field(None, description="Last update timestamp")
+    created_at: Optional[datetime] = _CREATED_AT
+    updated_at: Optional[datetime] = _UPDATED_AT
     context_artifacts: List[ArtifactRef] = Field(default_factory=list, description="Related artifacts")
-    subtasks: List[str] = Field(default_factory=list, description="Generated subtask descriptions")
+    subtasks: Tags = Field(default_factory=tuple, description="Generated subtask descriptions")
+
+
+TASK_LIST_ADAPTER = TypeAdapter(List[Task], config=_DEFER)
 
 
 class TaskCreate(BaseModel):
     """Schema for creating a new task"""
+    model_config = _DEFER
+    
     title: str
     description: Optional[str] = None
     priority: str = "medium"
     assignee: Optional[str] = None
     due_date: Optional[datetime] = None
-    context_artifacts: List[ArtifactRef] = Field(default_factory=list)
+    context_artifacts: List[ArtifactRef] = _LIST
 
 
 class TaskUpdate(BaseModel):
     """Schema for updating a task"""
+    model_config = _DEFER
+    
     title: Optional[str] = None
     description: Optional[str] = None
     status: Optional[TaskStatus] = None
     priority: Optional[str] = None
     assignee: Optional[str] = None
     due_date: Optional[datetime] = None
-    subtasks: Optional[List[str]] = None
+    subtasks: Optional[Tags] = None
 
 
 class Note(BaseModel):
     """Engineering note"""
+    model_config = _DEFER
+    
     id: Optional[str] = Field(None, description="Note ID (auto-generated)")
     title: str = Field(..., description="Note title")
-    body: str = Field(..., description="Note content (markdown)")
+    body: AIText = Field(..., description="Note content (markdown)")
     citations: List[ArtifactRef] = Field(default_factory=list, description="Cited artifacts")
-    tags: List[str] = Field(default_factory=list, description="Note tags")
-    created_at: Optional[datetime] = Field(None, description="Creation timestamp")
-    updated_at: Optional[datetime] = Field(None, description="Last update timestamp")
+    tags: Tags = Field(default_factory=tuple, description="Note tags")
+    created_at: Optional[datetime] = _CREATED_AT
+    updated_at: Optional[datetime] = _UPDATED_AT
     author: Optional[str] = Field(None, description="Note author")
 
 
 class NoteCreate(BaseModel):
     """Schema for creating a new note"""
+    model_config = _DEFER
+    
     title: str
-    body: str
-    citations: List[ArtifactRef] = Field(default_factory=list)
-    tags: List[str] = Field(default_factory=list)
+    body: AIText
+    citations: List[ArtifactRef] = _LIST
+    tags: Tags = _TUPLE
 
 
 class KnowledgeCard(BaseModel):
     """Knowledge base entry"""
+    model_config = _DEFER
+    
     id: str = Field(..., description="Knowledge card ID")
     title: str = Field(..., description="Card title")
     summary: str = Field(..., description="Brief summary")
     content: str = Field(..., description="Full content")
     source: str = Field(..., description="Source system or document")
-    tags: List[str] = Field(default_factory=list, description="Knowledge tags")
-    relevance_score: float = Field(..., description="Search relevance score")
+    tags: Tags = Field(default_factory=tuple, description="Knowledge tags")
+    relevance_bp: ScoreBasisPoints = Field(..., description="Search relevance score in basis points")
     artifact_refs: List[ArtifactRef] = Field(default_factory=list, description="Related artifacts")
+    
+    @computed_field(description="Search relevance score")
+    @property
+    def relevance_score(self) -> float:
+        return self.relevance_bp / 10000
+
+
+KNOWLEDGE_CARD_LIST_ADAPTER = TypeAdapter(List[KnowledgeCard], config=_DEFER)
 
 
 class WindowLink(BaseModel):
     """Link to external system window"""
+    model_config = _FROZEN
+    
     url: str = Field(..., description="URL to open")
     read_only: bool = Field(True, description="Whether the window is read-only")
     title: str = Field(..., description="Window title")
@@ -152,39 +293,58 @@ class WindowLink(BaseModel):
 
 class AIRequest(BaseModel):
     """Base request for AI operations"""
-    text: str = Field(..., description="Input text to process")
-    context: Optional[Dict[str, Any]] = Field(None, description="Additional context")
+    model_config = _DEFER
+    
+    text: AIText = Field(..., description="Input text to process")
+    context: Optional[MetadataDict] = Field(None, description="Additional context")
 
 
 class AISummaryResponse(BaseModel):
     """Response from AI summarization"""
+    model_config = _DEFER
+    
     summary: str = Field(..., description="Generated summary")
     key_points: List[str] = Field(default_factory=list, description="Key points extracted")
 
 
 class AISubtasksResponse(BaseModel):
     """Response from AI subtask generation"""
+    model_config = _DEFER
+    
     title: str = Field(..., description="Task title")
     subtasks: List[str] = Field(..., description="Generated subtask list")
 
 
 class AIBulletsResponse(BaseModel):
     """Response from AI bullet point generation"""
+    model_config = _DEFER
+    
     bullets: List[str] = Field(..., description="Generated bullet points")
 
 
 class DailyReport(BaseModel):
     """Daily summary report"""
+    model_config = _DEFER
+    
     report: str = Field(..., description="Plain text daily summary")
     date: datetime = Field(..., description="Report date")
     pulse_count: int = Field(..., description="Number of pulse items")
     task_count: int = Field(..., description="Number of active tasks")
-    coverage_percent: Optional[float] = Field(None, description="Test coverage percentage")
+    coverage_percent_bp: Optional[BasisPoints] = Field(None, description="Test coverage in basis points")
     risk_level: str = Field("medium", description="Overall risk assessment")
+    
+    @computed_field(description="Test coverage percentage")
+    @property
+    def coverage_percent(self) -> Optional[float]:
+        if self.coverage_percent_bp is None:
+            return None
+        return self.coverage_percent_bp / 100
 
 
 class ConfigResponse(BaseModel):
     """Application configuration response"""
+    model_config = _DEFER
+    
     features: Dict[str, bool] = Field(..., description="Feature flag states")
     themes: List[str] = Field(..., description="Available themes")
     mode: str = Field(..., description="Application mode")
@@ -192,12 +352,16 @@ class ConfigResponse(BaseModel):
 
 class ErrorResponse(BaseModel):
     """Standard error response"""
+    model_config = _DEFER
+    
     detail: str = Field(..., description="Error message")
     error_code: Optional[str] = Field(None, description="Specific error code")
 
 
 class UserIdentity(BaseModel):
     """User identity and biographical data"""
+    model_config = _DEFER
+    
     id: str = Field(..., description="User ID")
     full_name: str = Field(..., description="User's full name")
     first_name: str = Field(..., description="User's first name")
@@ -210,74 +374,109 @@ class UserIdentity(BaseModel):
 
 class PersonalityPreferences(BaseModel):
     """User personality and communication preferences"""
+    model_config = _DEFER
+    
     communication_style: str = Field("friendly", description="Communication style preference")
     encouragement_level: str = Field("medium", description="Level of encouragement desired")
     feedback_style: str = Field("supportive", description="Preferred feedback style")
-    interests: List[str] = Field(default_factory=list, description="User interests")
-    goals: List[str] = Field(default_factory=list, description="User goals")
+    interests: Tags = Field(default_factory=tuple, description="User interests")
+    goals: Tags = Field(default_factory=tuple, description="User goals")
     work_style: str = Field("", description="User's work style description")
 
 
 class Persona(BaseModel):
     """AI persona configuration"""
+    model_config = _DEFER
+    
     id: Optional[str] = Field(None, description="Persona ID")
     name: str = Field(..., description="Persona name")
     prompt: str = Field(..., description="Persona prompt template")
     model: str = Field("gpt-4o", description="AI model to use")
-    created_at: Optional[datetime] = Field(None, description="Creation timestamp")
-    updated_at: Optional[datetime] = Field(None, description="Last update timestamp")
+    created_at: Optional[datetime] = _CREATED_AT
+    updated_at: Optional[datetime] = _UPDATED_AT
 
 
 class AIFeedbackRequest(BaseModel):
     """Request for AI feedback with persona support"""
-    content: str = Field(..., description="Content to provide feedback on")
+    model_config = _DEFER
+    
+    content: AIText = Field(..., description="Content to provide feedback on")
     persona: Optional[Persona] = Field(None, description="Persona configuration")
-    context: Optional[Dict[str, Any]] = Field(None, description="Additional context")
+    context: Optional[MetadataDict] = Field(None, description="Additional context")
 
 
 class AIFeedbackResponse(BaseModel):
     """Response from AI feedback"""
-    model_config = {"protected_namespaces": ()}
+    model_config = ConfigDict(defer_build=True, protected_namespaces=())
     
     feedback: str = Field(..., description="Generated feedback")
     model_used: str = Field(..., description="AI model used")
     timestamp: datetime = Field(..., description="Response timestamp")
 
 
+class UserProfile(BaseModel):
+    """Extended profile fields for a user account"""
+    model_config = _FROZEN
+    
+    first_name: Optional[str] = Field(None, description="User's first name")
+    last_name: Optional[str] = Field(None, description="User's last name")
+    city: Optional[str] = Field(None, description="User's city")
+    timezone: str = Field("UTC", description="User's timezone")
+
+
+_PROFILE_FIELDS = ("first_name", "last_name", "city", "timezone")
+_PREFS_FIELDS = (
+    "communication_style", "encouragement_level", "feedback_style",
+    "interests", "goals", "work_style"
+)
+
+
 class User(BaseModel):
     """User model"""
+    model_config = _FROZEN
+    
     id: Optional[str] = Field(None, description="User ID (auto-generated)")
-    email: EmailStr = Field(..., description="User email address")
+    email: Email = Field(..., description="User email address")
     username: str = Field(..., description="Unique username")
     full_name: str = Field(..., description="User's full name")
-    role: UserRole = Field(UserRole.CONSUMER, description="User role")
+    role: UserRole = Field("consumer", description="User role")
     is_active: bool = Field(True, description="Whether user account is active")
     created_at: Optional[datetime] = Field(None, description="Account creation timestamp")
-    updated_at: Optional[datetime] = Field(None, description="Last update timestamp")
+    updated_at: Optional[datetime] = _UPDATED_AT
     last_login: Optional[datetime] = Field(None, description="Last login timestamp")
     
-    # Extended profile fields
-    first_name: Optional[str] = Field(None, description="User's first name")
-    last_name: Optional[str] = Field(None, description="User's last name")
-    city: Optional[str] = Field(None, description="User's city")
-    timezone: str = Field("UTC", description="User's timezone")
+    profile: UserProfile = Field(default_factory=UserProfile, description="Extended profile fields")
+    prefs: PersonalityPreferences = Field(default_factory=PersonalityPreferences, description="Personality preferences")
     
-    # Personality preferences
-    communication_style: str = Field("friendly", description="Communication style preference")
-    encouragement_level: str = Field("medium", description="Level of encouragement desired")
-    feedback_style: str = Field("supportive", description="Preferred feedback style")
-    interests: List[str] = Field(default_factory=list, description="User interests")
-    goals: List[str] = Field(default_factory=list, description="User goals")
-    work_style: str = Field("", description="User's work style description")
+    @model_validator(mode="before")
+    @classmethod
+    def _nest_flat_fields(cls, data: Any) -> Any:
+        """Accept flat user records (as kept in the user store) by folding profile/preference keys into their blocks"""
+        if not isinstance(data, dict) or "profile" in data or "prefs" in data:
+            return data
+        data = dict(data)
+        data["profile"] = {key: data.pop(key) for key in _PROFILE_FIELDS if key in data}
+        data["prefs"] = {key: data.pop(key) for key in _PREFS_FIELDS if key in data}
+        return data
+    
+    @model_serializer(mode="wrap")
+    def _flatten_blocks(self, handler) -> Dict[str, Any]:
+        """Serialize flat, keeping the profile/preference fields at the top level as the API always has"""
+        data = handler(self)
+        data.update(data.pop("profile"))
+        data.update(data.pop("prefs"))
+        return data
 
 
 class UserCreate(BaseModel):
     """Schema for creating a new user"""
-    email: EmailStr = Field(..., description="User email address")
+    model_config = _DEFER
+    
+    email: Email = Field(..., description="User email address")
     username: str = Field(..., description="Unique username")
     password: str = Field(..., min_length=8, description="User password")
     full_name: str = Field(..., description="User's full name")
-    role: UserRole = Field(UserRole.CONSUMER, description="User role")
+    role: UserRole = Field("consumer", description="User role")
     
     # Optional profile fields
     first_name: Optional[str] = None
@@ -288,12 +487,16 @@ class UserCreate(BaseModel):
 
 class UserLogin(BaseModel):
     """Schema for user login"""
+    model_config = _DEFER
+    
     username: str = Field(..., description="Username or email")
     password: str = Field(..., description="User password")
 
 
 class UserUpdate(BaseModel):
     """Schema for updating user profile"""
+    model_config = _DEFER
+    
     full_name: Optional[str] = None
     first_name: Optional[str] = None
     last_name: Optional[str] = None
@@ -302,13 +505,15 @@ class UserUpdate(BaseModel):
     communication_style: Optional[str] = None
     encouragement_level: Optional[str] = None
     feedback_style: Optional[str] = None
-    interests: Optional[List[str]] = None
-    goals: Optional[List[str]] = None
+    interests: Optional[Tags] = None
+    goals: Optional[Tags] = None
     work_style: Optional[str] = None
 
 
 class UserResponse(BaseModel):
     """Public user response (excludes sensitive data)"""
+    model_config = _FROZEN
+    
     id: str
     email: str
     username: str
@@ -319,16 +524,27 @@ class UserResponse(BaseModel):
     last_login: Optional[datetime] = None
 
 
+# User listings are encoded straight to JSON bytes in one pydantic-core pass
+USER_RESPONSE_LIST_ADAPTER = TypeAdapter(List[UserResponse], config=_DEFER)
+
+
 class Token(BaseModel):
     """JWT token response"""
+    model_config = _FROZEN
+    
     access_token: str = Field(..., description="JWT access token")
     token_type: str = Field("bearer", description="Token type")
     expires_in: int = Field(..., description="Token expiration in seconds")
     user: UserResponse = Field(..., description="User information")
 
 
-class TokenData(BaseModel):
-    """JWT token payload data"""
+@dataclass(frozen=True, slots=True)
+class TokenData:
+    """JWT token payload data.
+
+    Built on every authenticated request from an already-verified payload,
+    so it is a plain slotted dataclass rather than a validated model.
+    """
     username: Optional[str] = None
     user_id: Optional[str] = None
     role: Optional[UserRole] = None
@@ -337,9 +553,7 @@ class TokenData(BaseModel):
 
 class PasswordChange(BaseModel):
     """Schema for changing password"""
+    model_config = _DEFER
+    
     current_password: str = Field(..., description="Current password")
     new_password: str = Field(..., min_length=8, description="New password")
-
-
-# Update forward references
-ImpactNode.model_rebuild()
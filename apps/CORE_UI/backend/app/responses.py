@@ -0,0 +1,28 @@
+"""
+Response classes for CORE-SE Backend
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def _pydantic_default(obj: Any) -> Any:
+    """Serialize objects orjson does not handle natively"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson.
+
+    Only worth using on routes without a response model: when FastAPI knows
+    the response model it already serializes straight to bytes via Pydantic,
+    and a custom response class turns that fast path off.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_pydantic_default, option=orjson.OPT_NAIVE_UTC)
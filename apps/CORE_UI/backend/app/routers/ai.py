@@ -2,238 +2,505 @@
 AI API router - OpenAI microcalls for summaries, subtasks, etc.
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import Dict, Any
+from sqlalchemy import func, select
+from typing import Dict, Any, Tuple
 from datetime import datetime
+from contextlib import contextmanager
+from functools import lru_cache
+import asyncio
+import hashlib
+import httpx
+import logging
 import openai
 import json
-import random
+import re
+import time
+import uuid
+from cachetools import TTLCache
+from sse_starlette.sse import EventSourceResponse
 
-from app.config import get_settings
+try:
+    import tiktoken
+except ImportError:  # token counts fall back to a characters-per-token estimate
+    tiktoken = None
+
+from app.config import Settings, get_settings
+from app.ai_batching import MicroBatcher
 from app.models import (
     AIRequest, AISummaryResponse, AISubtasksResponse, 
     AIBulletsResponse, DailyReport, AIFeedbackRequest, 
     AIFeedbackResponse, UserIdentity, PersonalityPreferences
 )
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 from typing import List, Optional
-from app.database import get_db, TaskDB
+from app.database import get_db, get_sessionmaker, TaskDB
+from app.dependencies import SettingsDep, require_ai_feature
+from app.responses import FastJSONResponse
 from sqlalchemy import text
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(tags=["ai"])
 
+# Responses for the fixed-template microcalls, keyed by endpoint, model and a
+# digest of the input; identical requests are served without an OpenAI call
+_RESPONSE_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=3600)
 
-async def get_openai_client():
-    """Get OpenAI client"""
-    settings = get_settings()
-    if not settings.OPENAI_API_KEY:
-        raise HTTPException(status_code=501, detail="OpenAI API key not configured")
+
+# System prompts carry every fixed instruction so the leading tokens of each
+# request are byte-identical and eligible for OpenAI's automatic prompt caching;
+# user messages hold only the per-request payload
+SUMMARIZE_SYSTEM_PROMPT = (
+    "You are a helpful assistant that creates concise summaries and extracts key points from engineering documents.\n\n"
+    "Summarize the text provided by the user and extract its key points. "
+    "Provide a concise summary and list the main key points.\n"
+    "Response format should be JSON with 'summary' and 'key_points' fields."
+)
+
+SUBTASKS_SYSTEM_PROMPT = (
+    "You are a project management assistant that breaks down engineering tasks into actionable subtasks.\n\n"
+    "Break down the task provided by the user into specific, actionable subtasks, taking the given context into account. "
+    "Generate 3-7 specific subtasks that would help complete this main task.\n"
+    "Response format should be JSON with 'title' and 'subtasks' fields."
+)
+
+BULLETS_SYSTEM_PROMPT = (
+    "You are a technical writer that creates clear, concise bullet points from engineering content.\n\n"
+    "Convert the text provided by the user into clear, concise bullet points. "
+    "Create 3-8 bullet points that capture the essential information.\n"
+    "Response format should be JSON with 'bullets' field containing an array of strings."
+)
+
+DAILY_REPORT_SYSTEM_PROMPT = (
+    "You are an engineering manager assistant that creates daily status reports. Keep reports concise but informative.\n\n"
+    "Generate a concise daily summary report for engineering management from the status provided by the user."
+)
+
+
+SUMMARIZE_BATCH_SYSTEM_PROMPT = (
+    "You are a helpful assistant that creates concise summaries and extracts key points from engineering documents.\n\n"
+    "The user provides JSON with an 'items' array; each item has an 'id' and a 'text'. "
+    "Summarize each text independently and extract its key points.\n"
+    "Response format should be JSON with a 'results' array containing, for every item, "
+    "an object with the item's 'id', a 'summary' string and a 'key_points' array of strings."
+)
+
+BULLETS_BATCH_SYSTEM_PROMPT = (
+    "You are a technical writer that creates clear, concise bullet points from engineering content.\n\n"
+    "The user provides JSON with an 'items' array; each item has an 'id' and a 'text'. "
+    "Convert each text independently into 3-8 clear, concise bullet points that capture the essential information.\n"
+    "Response format should be JSON with a 'results' array containing, for every item, "
+    "an object with the item's 'id' and a 'bullets' array of strings."
+)
+
+# Used only when FEATURE_AI_BATCHING is enabled; batching trades up to one
+# window of added latency for fewer OpenAI calls under bursty load
+_BATCH_SYSTEM_PROMPTS = {
+    "summarize": SUMMARIZE_BATCH_SYSTEM_PROMPT,
+    "bullets": BULLETS_BATCH_SYSTEM_PROMPT,
+}
+
+# Batchers and the settings object they were built from. Built on first use;
+# when settings are reloaded (get_settings() hands out a new object) they are
+# rebuilt, and a replaced batcher still flushes the items it already queued.
+_batchers: Optional[Tuple[Settings, Dict[str, MicroBatcher]]] = None
+
+
+def _get_batcher(kind: str, settings: Settings) -> MicroBatcher:
+    """Batcher for an endpoint, configured from the current settings"""
+    global _batchers
+    if _batchers is None or _batchers[0] is not settings:
+        _batchers = (settings, {
+            name: MicroBatcher(prompt, settings.AI_BATCH_WINDOW_MS / 1000, settings.AI_BATCH_MAX_SIZE)
+            for name, prompt in _BATCH_SYSTEM_PROMPTS.items()
+        })
+    return _batchers[1][kind]
+
+
+def _json_schema_format(model: type) -> Dict[str, Any]:
+    """Strict structured-output response_format for a flat response model.
+
+    Strict mode needs every property listed as required and no defaults.
+    """
+    schema = model.model_json_schema()
+    properties = {
+        name: {key: value for key, value in prop.items() if key != "default"}
+        for name, prop in schema["properties"].items()
+    }
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": model.__name__,
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": properties,
+                "required": list(properties),
+                "additionalProperties": False
+            }
+        }
+    }
+
+
+SUMMARY_RESPONSE_FORMAT = _json_schema_format(AISummaryResponse)
+SUBTASKS_RESPONSE_FORMAT = _json_schema_format(AISubtasksResponse)
+BULLETS_RESPONSE_FORMAT = _json_schema_format(AIBulletsResponse)
+
+
+def _stream_completion(client: openai.AsyncOpenAI, final_event, **create_kwargs) -> EventSourceResponse:
+    """Relay a chat completion as server-sent events.
+
+    Emits a "delta" event per content chunk, then a "done" event whose JSON
+    payload comes from final_event(); failures end the stream with "error".
+    """
+    async def events():
+        try:
+            stream = await client.chat.completions.create(stream=True, **create_kwargs)
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield {"event": "delta", "data": chunk.choices[0].delta.content}
+        except openai.OpenAIError as e:
+            yield {"event": "error", "data": json.dumps({"detail": f"OpenAI API error: {str(e)}"})}
+            return
+        except Exception as e:
+            yield {"event": "error", "data": json.dumps({"detail": f"AI streaming error: {str(e)}"})}
+            return
+        
+        yield {"event": "done", "data": json.dumps(final_event(), default=str)}
     
-    return openai.AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+    return EventSourceResponse(events())
 
 
-@router.post("/ai/summarize", response_model=AISummaryResponse)
-async def summarize_text(request: AIRequest):
-    """Generate AI summary of text"""
-    settings = get_settings()
+def _cache_key(endpoint: str, model: str, text: str, context: Optional[Dict[str, Any]] = None) -> tuple:
+    """Cache key for a microcall response"""
+    digest = hashlib.sha256(text.encode("utf-8"))
+    if context:
+        digest.update(json.dumps(context, sort_keys=True, default=str).encode("utf-8"))
+    return (endpoint, model, digest.hexdigest())
+
+
+def _create_http_client(settings) -> httpx.AsyncClient:
+    """HTTP client for OpenAI calls, on the aiohttp transport when the extra is installed"""
+    limits = httpx.Limits(max_connections=200, max_keepalive_connections=100)
     
-    if not settings.FEATURE_AI_MICROCALLS:
-        raise HTTPException(status_code=503, detail="AI microcalls feature is disabled")
+    aiohttp_client = getattr(openai, "DefaultAioHttpClient", None)
+    if aiohttp_client is not None:
+        try:
+            return aiohttp_client(limits=limits, timeout=settings.AI_TIMEOUT)
+        except RuntimeError:
+            pass  # openai[aiohttp] not installed
     
-    try:
-        client = await get_openai_client()
-        
-        prompt = f"""
-        Please summarize the following text and extract key points:
-        
-        Text: {request.text}
-        
-        Provide a concise summary and list the main key points.
-        Response format should be JSON with 'summary' and 'key_points' fields.
-        """
-        
-        response = await client.chat.completions.create(
-            model=settings.OPENAI_MODEL,
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that creates concise summaries and extracts key points from engineering documents."},
-                {"role": "user", "content": prompt}
-            ],
-            response_format={"type": "json_object"},
-            timeout=settings.AI_TIMEOUT
-        )
-        
-        result = json.loads(response.choices[0].message.content)
-        
-        return AISummaryResponse(
-            summary=result.get("summary", "Summary generation failed"),
-            key_points=result.get("key_points", [])
-        )
-        
-    except openai.OpenAIError as e:
-        raise HTTPException(status_code=502, detail=f"OpenAI API error: {str(e)}")
-    except json.JSONDecodeError:
-        raise HTTPException(status_code=502, detail="Invalid response format from AI")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"AI processing error: {str(e)}")
+    return httpx.AsyncClient(limits=limits, timeout=settings.AI_TIMEOUT)
 
 
-@router.post("/ai/subtasks", response_model=AISubtasksResponse)
-async def generate_subtasks(request: AIRequest):
-    """Generate AI subtasks for a given task description"""
+def create_openai_client() -> Optional[openai.AsyncOpenAI]:
+    """Build the shared OpenAI client, or None when no API key is configured.
+
+    Called once from the app lifespan; the pooled HTTP client keeps
+    connections (and TLS sessions) alive across requests.
+    """
     settings = get_settings()
+    if not settings.OPENAI_API_KEY:
+        return None
     
-    if not settings.FEATURE_AI_MICROCALLS:
-        raise HTTPException(status_code=503, detail="AI microcalls feature is disabled")
+    return openai.AsyncOpenAI(api_key=settings.OPENAI_API_KEY, http_client=_create_http_client(settings))
+
+
+async def get_openai_client(request: Request) -> openai.AsyncOpenAI:
+    """Get the shared OpenAI client"""
+    client = getattr(request.app.state, "openai", None)
+    if client is None:
+        raise HTTPException(status_code=501, detail="OpenAI API key not configured")
     
+    return client
+
+
+@contextmanager
+def _openai_errors(label: str = "AI processing error"):
+    """Map failures around an OpenAI call to HTTP errors"""
     try:
-        client = await get_openai_client()
-        
-        prompt = f"""
-        Break down the following task into specific, actionable subtasks:
-        
-        Task: {request.text}
-        
-        Context: {request.context if request.context else 'Engineering task breakdown'}
-        
-        Generate 3-7 specific subtasks that would help complete this main task.
-        Response format should be JSON with 'title' and 'subtasks' fields.
-        """
-        
-        response = await client.chat.completions.create(
-            model=settings.OPENAI_MODEL,
-            messages=[
-                {"role": "system", "content": "You are a project management assistant that breaks down engineering tasks into actionable subtasks."},
-                {"role": "user", "content": prompt}
-            ],
-            response_format={"type": "json_object"},
-            timeout=settings.AI_TIMEOUT
-        )
-        
-        result = json.loads(response.choices[0].message.content)
-        
-        return AISubtasksResponse(
-            title=result.get("title", request.text[:50] + "..."),
-            subtasks=result.get("subtasks", [])
-        )
-        
+        yield
+    except HTTPException:
+        raise
     except openai.OpenAIError as e:
         raise HTTPException(status_code=502, detail=f"OpenAI API error: {str(e)}")
-    except json.JSONDecodeError:
+    except (json.JSONDecodeError, ValidationError):
         raise HTTPException(status_code=502, detail="Invalid response format from AI")
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"AI processing error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"{label}: {str(e)}")
 
 
-@router.post("/ai/bullets", response_model=AIBulletsResponse)
-async def generate_bullets(request: AIRequest):
-    """Generate AI bullet points from text"""
-    settings = get_settings()
+async def openai_call(
+    client: openai.AsyncOpenAI,
+    *,
+    model: str,
+    messages: List[Dict[str, str]],
+    timeout: float,
+    response_format: Optional[Dict[str, Any]] = None,
+    response_model: Optional[type] = None,
+    cache_key: Optional[tuple] = None,
+    error_label: str = "AI processing error",
+    **options
+):
+    """Run one chat completion: cache lookup, call, parse, cache write, error mapping.
+
+    Returns the reply parsed into response_model when given, otherwise the raw
+    message text.
+    """
+    if cache_key is not None:
+        cached = _RESPONSE_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
     
-    if not settings.FEATURE_AI_MICROCALLS:
-        raise HTTPException(status_code=503, detail="AI microcalls feature is disabled")
+    if response_format is not None:
+        options["response_format"] = response_format
     
-    try:
-        client = await get_openai_client()
-        
-        prompt = f"""
-        Convert the following text into clear, concise bullet points:
-        
-        Text: {request.text}
-        
-        Create 3-8 bullet points that capture the essential information.
-        Response format should be JSON with 'bullets' field containing an array of strings.
-        """
-        
+    with _openai_errors(error_label):
         response = await client.chat.completions.create(
-            model=settings.OPENAI_MODEL,
-            messages=[
-                {"role": "system", "content": "You are a technical writer that creates clear, concise bullet points from engineering content."},
-                {"role": "user", "content": prompt}
-            ],
-            response_format={"type": "json_object"},
-            timeout=settings.AI_TIMEOUT
-        )
-        
-        result = json.loads(response.choices[0].message.content)
-        
-        return AIBulletsResponse(
-            bullets=result.get("bullets", [])
+            model=model,
+            messages=messages,
+            timeout=timeout,
+            **options
         )
-        
-    except openai.OpenAIError as e:
-        raise HTTPException(status_code=502, detail=f"OpenAI API error: {str(e)}")
-    except json.JSONDecodeError:
-        raise HTTPException(status_code=502, detail="Invalid response format from AI")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"AI processing error: {str(e)}")
+        content = response.choices[0].message.content
+        result = response_model.model_validate_json(content) if response_model is not None else content
+    
+    if cache_key is not None:
+        _RESPONSE_CACHE[cache_key] = result
+    return result
 
 
-@router.post("/ai/daily_report", response_model=DailyReport)
-async def generate_daily_report(db: AsyncSession = Depends(get_db)):
-    """Generate AI daily summary report"""
-    settings = get_settings()
+async def _batched_call(batcher: MicroBatcher, client: openai.AsyncOpenAI, settings, text: str, cache_key: tuple, response_model: type):
+    """openai_call counterpart for micro-batched requests.
+
+    Only a complete item is cached: one the model dropped from the batch, or
+    one that does not validate against response_model, is a 502.
+    """
+    cached = _RESPONSE_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
     
-    if not settings.FEATURE_AI_MICROCALLS:
-        raise HTTPException(status_code=503, detail="AI microcalls feature is disabled")
+    with _openai_errors():
+        item = await batcher.submit(client, settings.OPENAI_MODEL, settings.AI_TIMEOUT, text)
+        if item is None:
+            raise HTTPException(status_code=502, detail="AI response was missing this item")
+        result = response_model.model_validate(item)
     
-    try:
-        # Get current tasks
-        result = await db.execute(select(TaskDB))
-        tasks = result.scalars().all()
-        
-        # Count active tasks
-        active_tasks = [task for task in tasks if task.status in ["open", "in_progress"]]
-        completed_tasks = [task for task in tasks if task.status == "completed"]
-        
-        # Mock pulse data (in real implementation, would fetch from pulse endpoint)
-        pulse_count = 15  # Mock number
-        
-        # Create context for AI
-        context = f"""
-        Current engineering status:
-        - Total tasks: {len(tasks)}
-        - Active tasks: {len(active_tasks)}
-        - Completed tasks: {len(completed_tasks)}
-        - Recent activity items: {pulse_count}
-        
-        Recent task titles:
-        {chr(10).join([f"- {task.title} ({task.status})" for task in active_tasks[:5]])}
-        
-        Generate a concise daily summary report for engineering management.
-        """
-        
-        client = await get_openai_client()
-        
-        response = await client.chat.completions.create(
-            model=settings.OPENAI_MODEL,
-            messages=[
-                {"role": "system", "content": "You are an engineering manager assistant that creates daily status reports. Keep reports concise but informative."},
-                {"role": "user", "content": context}
-            ],
-            timeout=settings.AI_TIMEOUT
+    _RESPONSE_CACHE[cache_key] = result
+    return result
+
+
+@router.post("/ai/summarize", response_model=AISummaryResponse, dependencies=[Depends(require_ai_feature)])
+async def summarize_text(
+    request: AIRequest,
+    settings: SettingsDep,
+    client: openai.AsyncOpenAI = Depends(get_openai_client)
+):
+    """Generate AI summary of text"""
+    cache_key = _cache_key("summarize", settings.OPENAI_MODEL, request.text)
+    
+    if settings.FEATURE_AI_BATCHING:
+        return await _batched_call(
+            _get_batcher("summarize", settings), client, settings, request.text, cache_key, AISummaryResponse
         )
-        
-        report_text = response.choices[0].message.content
-        
-        # Mock coverage and risk calculation
-        coverage_percent = round(85.0 + random.uniform(-10, 10), 1)
-        risk_level = "low" if coverage_percent > 80 else "medium" if coverage_percent > 60 else "high"
-        
-        return DailyReport(
-            report=report_text,
-            date=datetime.now(),
-            pulse_count=pulse_count,
-            task_count=len(active_tasks),
-            coverage_percent=coverage_percent,
-            risk_level=risk_level
+    
+    return await openai_call(
+        client,
+        model=settings.OPENAI_MODEL,
+        messages=[
+            {"role": "system", "content": SUMMARIZE_SYSTEM_PROMPT},
+            {"role": "user", "content": request.text}
+        ],
+        response_format=SUMMARY_RESPONSE_FORMAT,
+        response_model=AISummaryResponse,
+        timeout=settings.AI_TIMEOUT,
+        cache_key=cache_key
+    )
+
+
+@router.post("/ai/subtasks", response_model=AISubtasksResponse, dependencies=[Depends(require_ai_feature)])
+async def generate_subtasks(
+    request: AIRequest,
+    settings: SettingsDep,
+    client: openai.AsyncOpenAI = Depends(get_openai_client)
+):
+    """Generate AI subtasks for a given task description"""
+    prompt = f"Task: {request.text}\n\nContext: {request.context if request.context else 'Engineering task breakdown'}"
+    
+    return await openai_call(
+        client,
+        model=settings.OPENAI_MODEL,
+        messages=[
+            {"role": "system", "content": SUBTASKS_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ],
+        response_format=SUBTASKS_RESPONSE_FORMAT,
+        response_model=AISubtasksResponse,
+        timeout=settings.AI_TIMEOUT,
+        cache_key=_cache_key("subtasks", settings.OPENAI_MODEL, request.text, request.context)
+    )
+
+
+@router.post("/ai/bullets", response_model=AIBulletsResponse, dependencies=[Depends(require_ai_feature)])
+async def generate_bullets(
+    request: AIRequest,
+    settings: SettingsDep,
+    client: openai.AsyncOpenAI = Depends(get_openai_client)
+):
+    """Generate AI bullet points from text"""
+    cache_key = _cache_key("bullets", settings.OPENAI_MODEL, request.text)
+    
+    if settings.FEATURE_AI_BATCHING:
+        return await _batched_call(
+            _get_batcher("bullets", settings), client, settings, request.text, cache_key, AIBulletsResponse
         )
-        
-    except openai.OpenAIError as e:
-        raise HTTPException(status_code=502, detail=f"OpenAI API error: {str(e)}")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Daily report generation error: {str(e)}")
+    
+    return await openai_call(
+        client,
+        model=settings.OPENAI_MODEL,
+        messages=[
+            {"role": "system", "content": BULLETS_SYSTEM_PROMPT},
+            {"role": "user", "content": request.text}
+        ],
+        response_format=BULLETS_RESPONSE_FORMAT,
+        response_model=AIBulletsResponse,
+        timeout=settings.AI_TIMEOUT,
+        cache_key=cache_key
+    )
+
+
+# Daily reports are generated in the background and served precomputed; a
+# report older than this is refreshed while the previous one is still served
+DAILY_REPORT_MAX_AGE_SECONDS = 3600
+
+_ACTIVE_TASK_STATUSES = ("open", "in_progress")
+
+_daily_report: Optional[Tuple[str, float, DailyReport]] = None  # (day, generated_at, report)
+_daily_report_task: Optional[asyncio.Task] = None
+_daily_report_task_id: Optional[str] = None
+
+
+async def build_daily_report(db: AsyncSession, client: openai.AsyncOpenAI, settings) -> DailyReport:
+    """Generate the daily summary report"""
+    # Count tasks by state in one aggregate query
+    is_active = TaskDB.status.in_(_ACTIVE_TASK_STATUSES)
+    counts = await db.execute(
+        select(
+            func.count(),
+            func.count().filter(is_active),
+            func.count().filter(TaskDB.status == "completed")
+        ).select_from(TaskDB)
+    )
+    total_count, active_count, completed_count = counts.one()
+    
+    # Only the few titles shown in the prompt are loaded
+    recent = await db.execute(select(TaskDB.title, TaskDB.status).where(is_active).limit(5))
+    active_tasks = recent.all()
+    
+    # Mock pulse data (in real implementation, would fetch from pulse endpoint)
+    pulse_count = 15  # Mock number
+    
+    # Create context for AI
+    context = f"""
+    Current engineering status:
+    - Total tasks: {total_count}
+    - Active tasks: {active_count}
+    - Completed tasks: {completed_count}
+    - Recent activity items: {pulse_count}
+    
+    Recent task titles:
+    {chr(10).join([f"- {task.title} ({task.status})" for task in active_tasks])}
+    """
+    
+    response = await client.chat.completions.create(
+        model=settings.OPENAI_MODEL,
+        messages=[
+            {"role": "system", "content": DAILY_REPORT_SYSTEM_PROMPT},
+            {"role": "user", "content": context}
+        ],
+        timeout=settings.AI_TIMEOUT
+    )
+    
+    report_text = response.choices[0].message.content
+    
+    # Coverage is the completed share of all tasks, so the same data always
+    # yields the same report figures
+    coverage_percent_bp = round(10000 * completed_count / max(total_count, 1))
+    risk_level = "low" if coverage_percent_bp > 8000 else "medium" if coverage_percent_bp > 6000 else "high"
+    
+    return DailyReport(
+        report=report_text,
+        date=datetime.now(),
+        pulse_count=pulse_count,
+        task_count=active_count,
+        coverage_percent_bp=coverage_percent_bp,
+        risk_level=risk_level
+    )
+
+
+async def _refresh_daily_report(client: openai.AsyncOpenAI, settings) -> None:
+    """Regenerate the daily report on its own database session"""
+    global _daily_report
+    
+    async with get_sessionmaker()() as db:
+        report = await build_daily_report(db, client, settings)
+    _daily_report = (report.date.date().isoformat(), time.monotonic(), report)
+
+
+def _log_daily_report_failure(task: asyncio.Task) -> None:
+    """Log a failed background refresh, which a stale report would otherwise hide"""
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Daily report refresh failed: {task.exception()}")
+
+
+def _schedule_daily_report_refresh(client: openai.AsyncOpenAI, settings) -> str:
+    """Start a background refresh unless one is already running; returns its task id"""
+    global _daily_report_task, _daily_report_task_id
+    
+    if _daily_report_task is None or _daily_report_task.done():
+        _daily_report_task_id = uuid.uuid4().hex
+        _daily_report_task = asyncio.create_task(_refresh_daily_report(client, settings))
+        _daily_report_task.add_done_callback(_log_daily_report_failure)
+    return _daily_report_task_id
+
+
+_DAILY_REPORT_ROUTE = dict(
+    response_model=DailyReport,
+    responses={202: {"description": "Report is being generated"}},
+    dependencies=[Depends(require_ai_feature)]
+)
+
+
+@router.get("/ai/daily_report", **_DAILY_REPORT_ROUTE)
+@router.post("/ai/daily_report", **_DAILY_REPORT_ROUTE)
+async def generate_daily_report(settings: SettingsDep, client: openai.AsyncOpenAI = Depends(get_openai_client)):
+    """Get the precomputed AI daily summary report, refreshing it in the background when stale"""
+    global _daily_report_task
+    
+    today = datetime.now().date().isoformat()
+    current = _daily_report if _daily_report and _daily_report[0] == today else None
+    
+    if current is None and _daily_report_task is not None and _daily_report_task.done():
+        # Surface a failed generation once, then let the next request retry;
+        # a cancelled refresh has no error and is simply rescheduled below
+        error = None if _daily_report_task.cancelled() else _daily_report_task.exception()
+        _daily_report_task = None
+        if isinstance(error, openai.OpenAIError):
+            raise HTTPException(status_code=502, detail=f"OpenAI API error: {str(error)}")
+        if error is not None:
+            raise HTTPException(status_code=500, detail=f"Daily report generation error: {str(error)}")
+        current = _daily_report if _daily_report and _daily_report[0] == today else None
+    
+    if current is None or time.monotonic() - current[1] > DAILY_REPORT_MAX_AGE_SECONDS:
+        task_id = _schedule_daily_report_refresh(client, settings)
+        if current is None:
+            return JSONResponse(status_code=202, content={"status": "pending", "task_id": task_id})
+    
+    return current[2]
 
 
 # Real user identity data from your profile system
@@ -296,49 +563,41 @@ def has_personality_data() -> bool:
         return False
 
 
+# Persona prompt placeholders and the identity field each one is filled from
+_PERSONA_KEY = {
+    "[User's Full Name]": "full_name",
+    "[City]": "city",
+    "[First Name]": "first_name",
+    "[Last Name]": "last_name",
+    "[Timezone]": "timezone"
+}
+_PERSONA_RE = re.compile("|".join(map(re.escape, _PERSONA_KEY)))
+
+
 def substitute_persona_placeholders(prompt: str, identity: UserIdentity) -> str:
     """Replace placeholders in persona prompts with actual user data"""
-    replacements = {
-        "[User's Full Name]": identity.full_name,
-        "[City]": identity.city,
-        "[First Name]": identity.first_name,
-        "[Last Name]": identity.last_name,
-        "[Timezone]": identity.timezone
-    }
-    
-    result = prompt
-    for placeholder, value in replacements.items():
-        result = result.replace(placeholder, value)
-    
-    return result
+    return _PERSONA_RE.sub(lambda match: getattr(identity, _PERSONA_KEY[match.group(0)]), prompt)
 
 
-@router.post("/ai/feedback", response_model=AIFeedbackResponse)
-async def get_ai_feedback(request: AIFeedbackRequest):
-    """Generate AI feedback with persona support"""
-    settings = get_settings()
+@lru_cache(maxsize=64)
+def _feedback_system_message(persona_prompt: Optional[str], identity_version: datetime) -> str:
+    """Feedback system message for a persona prompt (None for the default persona).
+
+    The identity and personality data are module-level profiles, so the message
+    only changes with the persona; identity_version (the profile's updated_at)
+    keys the cache so an updated profile is never served stale. Reusing the
+    exact string also keeps the prompt prefix stable for OpenAI's prompt cache.
+    """
+    identity = get_user_identity()
+    personality = get_personality_preferences()
     
-    if not settings.FEATURE_AI_MICROCALLS:
-        raise HTTPException(status_code=503, detail="AI microcalls feature is disabled")
+    if persona_prompt is not None:
+        persona_prompt = substitute_persona_placeholders(persona_prompt, identity)
+    else:
+        # Default supportive persona
+        persona_prompt = f"You are a supportive and encouraging assistant. Address the user warmly as {identity.full_name} and provide thoughtful, empathetic feedback. Be personal and caring in your response."
     
-    try:
-        client = await get_openai_client()
-        
-        # Get user identity and personality data
-        identity = get_user_identity()
-        personality = get_personality_preferences()
-        
-        # Use persona if provided, otherwise create default supportive persona
-        if request.persona:
-            persona_prompt = substitute_persona_placeholders(request.persona.prompt, identity)
-            model = request.persona.model or settings.OPENAI_MODEL
-        else:
-            # Default supportive persona
-            persona_prompt = f"You are a supportive and encouraging assistant. Address the user warmly as {identity.full_name} and provide thoughtful, empathetic feedback. Be personal and caring in your response."
-            model = settings.OPENAI_MODEL
-        
-        # Create system message with persona
-        system_message = f"""
+    return f"""
         {persona_prompt}
         
         User Context:
@@ -353,40 +612,62 @@ async def get_ai_feedback(request: AIFeedbackRequest):
         
         Provide personalized, empathetic feedback that takes into account the user's preferences and context.
         """
-        
-        response = await client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": request.content}
-            ],
-            timeout=settings.AI_TIMEOUT
-        )
-        
-        feedback_text = response.choices[0].message.content
-        
-        return AIFeedbackResponse(
-            feedback=feedback_text,
-            model_used=model,
-            timestamp=datetime.now()
+
+
+@router.post("/ai/feedback", response_model=AIFeedbackResponse, dependencies=[Depends(require_ai_feature)])
+async def get_ai_feedback(
+    request: AIFeedbackRequest,
+    settings: SettingsDep,
+    client: openai.AsyncOpenAI = Depends(get_openai_client),
+    stream: bool = Query(False, description="Stream the feedback as server-sent events")
+):
+    """Generate AI feedback with persona support"""
+    # Use persona if provided, otherwise the default supportive persona
+    if request.persona:
+        persona_prompt = request.persona.prompt
+        model = request.persona.model or settings.OPENAI_MODEL
+    else:
+        persona_prompt = None
+        model = settings.OPENAI_MODEL
+    
+    # System message with persona and user context, built once per persona
+    system_message = _feedback_system_message(persona_prompt, get_user_identity().updated_at)
+    
+    create_kwargs = dict(
+        model=model,
+        messages=[
+            {"role": "system", "content": system_message},
+            {"role": "user", "content": request.content}
+        ],
+        timeout=settings.AI_TIMEOUT
+    )
+    
+    if stream:
+        return _stream_completion(
+            client,
+            lambda: {"model_used": model, "timestamp": datetime.now().isoformat()},
+            **create_kwargs
         )
-        
-    except openai.OpenAIError as e:
-        raise HTTPException(status_code=502, detail=f"OpenAI API error: {str(e)}")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"AI feedback generation error: {str(e)}")
+    
+    feedback_text = await openai_call(client, error_label="AI feedback generation error", **create_kwargs)
+    
+    return AIFeedbackResponse(
+        feedback=feedback_text,
+        model_used=model,
+        timestamp=datetime.now()
+    )
 
 
-@router.get("/ai/identity-check")
-async def check_identity_profile():
+@router.get("/ai/identity-check", response_class=FastJSONResponse)
+async def check_identity_profile(settings: SettingsDep):
     """Check the status of user identity profile for debugging"""
     return {
         "hasIdentityProfile": has_identity_profile(),
         "hasBiographical": has_biographical_data(), 
         "hasPersonality": has_personality_data(),
-        "selectedModel": get_settings().OPENAI_MODEL,
-        "userIdentity": get_user_identity().dict() if has_identity_profile() else None,
-        "personalityPrefs": get_personality_preferences().dict() if has_personality_data() else None
+        "selectedModel": settings.OPENAI_MODEL,
+        "userIdentity": get_user_identity().model_dump() if has_identity_profile() else None,
+        "personalityPrefs": get_personality_preferences().model_dump() if has_personality_data() else None
     }
 
 
@@ -403,6 +684,7 @@ class ChatRequest(BaseModel):
     context_id: Optional[str] = None  # ID of specific requirement or context
     include_requirements: Optional[bool] = False
     requirement_filters: Optional[Dict[str, Any]] = None
+    session_id: Optional[str] = None  # Stable per conversation; routes turns to the same prompt cache
 
 class ChatResponse(BaseModel):
     message: str
@@ -422,111 +704,212 @@ class ContextSearchResponse(BaseModel):
     context_type: str
 
 
-@router.post("/ai/chat", response_model=ChatResponse)
+# Token budget for prior conversation turns sent with each chat message
+CHAT_HISTORY_TOKEN_BUDGET = 2000
+
+# Approximate per-message overhead of the chat format (role, separators)
+_MESSAGE_TOKEN_OVERHEAD = 4
+
+
+# Histories longer than this (in characters) are tokenized on the threadpool
+# so a long conversation does not hold up the event loop
+_THREADPOOL_HISTORY_CHARS = 20_000
+
+# Tokenizer for the configured chat model, set by load_encoding() at startup;
+# while it is None, token counts fall back to a characters-per-token estimate
+_encoding = None
+
+
+def load_encoding(model: str) -> None:
+    """Load the tokenizer for a model.
+
+    Blocking: tiktoken may download the BPE file on first use, so this runs
+    once at startup rather than on a request.
+    """
+    global _encoding
+    if tiktoken is None:
+        return
+    try:
+        try:
+            _encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            _encoding = tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logger.warning(f"Could not load tokenizer for {model}, estimating token counts: {e}")
+
+
+def _count_tokens(content: str) -> int:
+    """Token count of a message's content"""
+    if _encoding is None:
+        return len(content) // 4 + 1
+    return len(_encoding.encode(content))
+
+
+def _truncate_history(history: List[ChatMessage], budget: int = CHAT_HISTORY_TOKEN_BUDGET) -> List[ChatMessage]:
+    """Most recent messages whose combined size fits within the token budget"""
+    used = 0
+    start = len(history)
+    for index in range(len(history) - 1, -1, -1):
+        used += _count_tokens(history[index].content) + _MESSAGE_TOKEN_OVERHEAD
+        if used > budget:
+            break
+        start = index
+    return history[start:]
+
+
+# Table names for the database chat context; the schema rarely changes, so the
+# lookup is cached briefly instead of querying sqlite_master on every turn
+_schema_tables_cache: TTLCache = TTLCache(maxsize=1, ttl=60)
+
+_TABLES_QUERY = text(
+    "SELECT name FROM sqlite_master WHERE type='table' "
+    "AND name NOT LIKE 'sqlite_%' AND name NOT LIKE 'requirements_fts%'"
+)
+
+
+# Optional requirement filters. Only the filters a request sets go into the
+# SQL, as plain equality tests SQLite can answer from the column indexes; the
+# statement for each combination is built once (8 variants per query)
+_REQUIREMENT_FILTER_COLUMNS = ("status", "category", "criticality")
+
+_REQUIREMENT_BY_ID_QUERY = text("SELECT * FROM requirements WHERE id = :req_id")
+
+# Only the columns shown in the chat summary, and only as many rows as it holds
+_REQUIREMENTS_SUMMARY_SQL = "SELECT id, title, status, criticality FROM requirements WHERE {filters} LIMIT 10"
+
+
+def _requirement_filter_params(filters: Dict[str, Any]) -> Dict[str, Any]:
+    """Bind values for the requirement filters that are set"""
+    return {name: filters[name] for name in _REQUIREMENT_FILTER_COLUMNS if filters.get(name)}
+
+
+@lru_cache(maxsize=None)
+def _filtered_query(sql: str, filter_names: Tuple[str, ...]):
+    """Statement for a query template restricted by the named filters"""
+    conditions = " AND ".join(f"{name} = :{name}" for name in filter_names) or "1 = 1"
+    return text(sql.format(filters=conditions))
+
+
+async def _get_table_names(db: AsyncSession) -> List[str]:
+    """User table names, cached for a minute"""
+    tables = _schema_tables_cache.get("tables")
+    if tables is None:
+        result = await db.execute(_TABLES_QUERY)
+        tables = [row[0] for row in result]
+        _schema_tables_cache["tables"] = tables
+    return tables
+
+
+async def _load_requirement_ctx(db: AsyncSession, requirement_id: str) -> Optional[Dict[str, Any]]:
+    """The requirement the user is viewing, if it exists"""
+    result = await db.execute(_REQUIREMENT_BY_ID_QUERY, {"req_id": requirement_id})
+    row = result.mappings().first()
+    return dict(row) if row is not None else None
+
+
+async def _load_requirements_summary(db: AsyncSession, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Summary rows for the general requirements context"""
+    params = _requirement_filter_params(filters)
+    result = await db.execute(_filtered_query(_REQUIREMENTS_SUMMARY_SQL, tuple(params)), params)
+    return [dict(row) for row in result.mappings()]
+
+
+async def _load_schema_ctx() -> Optional[List[str]]:
+    """Table names for the database context, or None if they can't be read.
+
+    Uses its own session so it can run alongside queries on the request session.
+    """
+    try:
+        tables = _schema_tables_cache.get("tables")
+        if tables is None:
+            async with get_sessionmaker()() as db:
+                tables = await _get_table_names(db)
+        return tables
+    except Exception as e:
+        print(f"Error getting database context: {e}")
+        return None
+
+
+@router.post("/ai/chat", response_model=ChatResponse, dependencies=[Depends(require_ai_feature)])
 async def chat_with_context(
     request: ChatRequest,
-    db: AsyncSession = Depends(get_db)
+    settings: SettingsDep,
+    db: AsyncSession = Depends(get_db),
+    client: openai.AsyncOpenAI = Depends(get_openai_client),
+    stream: bool = Query(False, description="Stream the reply as server-sent events")
 ):
     """AI chat with requirements context support"""
-    settings = get_settings()
-    
-    if not settings.FEATURE_AI_MICROCALLS:
-        raise HTTPException(status_code=503, detail="AI chat feature is disabled")
-    
     try:
-        client = await get_openai_client()
         identity = get_user_identity()
         
-        # Build context based on request
+        # Build context based on request. The system message only holds what stays
+        # the same across turns so the provider can cache the prompt prefix; the
+        # per-turn requirement context goes after the history instead.
         context_info = {}
         system_context = f"You are an AI assistant helping {identity.full_name} with CORE-SE requirements traceability system."
+        turn_context = ""
         
+        # The context sources are independent, so they load concurrently
+        loaders = {}
         if request.context_type == "requirement" and request.context_id:
-            # Get specific requirement context
-            req_query = text("SELECT * FROM requirements WHERE id = :req_id")
-            result = await db.execute(req_query, {"req_id": request.context_id})
-            requirement = result.fetchone()
-            
-            if requirement:
-                context_info["selected_requirement"] = dict(requirement._mapping)
-                system_context += f" The user is currently viewing requirement {requirement.id}: {requirement.title}."
-        
+            loaders["requirement"] = _load_requirement_ctx(db, request.context_id)
         elif request.include_requirements:
-            # Get general requirements context with filters
             filters = request.requirement_filters or {}
-            where_clauses = []
-            params = {}
-            
-            if filters.get("status"):
-                where_clauses.append("status = :status")
-                params["status"] = filters["status"]
-            if filters.get("category"):
-                where_clauses.append("category = :category")
-                params["category"] = filters["category"]
-            if filters.get("criticality"):
-                where_clauses.append("criticality = :criticality")
-                params["criticality"] = filters["criticality"]
-            
-            where_clause = " AND ".join(where_clauses) if where_clauses else "1=1"
-            reqs_query = text(f"SELECT id, title, status, category, criticality, description FROM requirements WHERE {where_clause} LIMIT 20")
-            
-            result = await db.execute(reqs_query, params)
-            requirements = [dict(row._mapping) for row in result.fetchall()]
-            
+            loaders["requirements"] = _load_requirements_summary(db, filters)
+        if request.context_type == "database":
+            loaders["tables"] = _load_schema_ctx()
+        
+        loaded = dict(zip(loaders, await asyncio.gather(*loaders.values())))
+        
+        requirement = loaded.get("requirement")
+        if requirement:
+            context_info["selected_requirement"] = requirement
+            turn_context += f" The user is currently viewing requirement {requirement['id']}: {requirement['title']}."
+        
+        if "requirements" in loaded:
+            requirements = loaded["requirements"]
             context_info["requirements_summary"] = {
                 "count": len(requirements),
-                "items": requirements[:10],  # Limit to avoid token overflow
+                "items": requirements,
                 "filters_applied": filters
             }
             
-            system_context += f" The user has access to {len(requirements)} requirements in the database."
+            turn_context += f" The user has access to {len(requirements)} requirements in the database."
         
-        if request.context_type == "database":
-            # Get database schema context
-            try:
-                # Get table names
-                tables_query = text("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'")
-                result = await db.execute(tables_query)
-                tables = [row[0] for row in result.fetchall()]
-                
-                context_info["database_schema"] = {
-                    "tables": tables,
-                    "description": "SQLite database with requirements traceability data"
-                }
-                
-                system_context += f" The database contains tables: {', '.join(tables)}."
-            except Exception as e:
-                print(f"Error getting database context: {e}")
+        tables = loaded.get("tables")
+        if tables is not None:
+            context_info["database_schema"] = {
+                "tables": tables,
+                "description": "SQLite database with requirements traceability data"
+            }
+            
+            system_context += f" The database contains tables: {', '.join(tables)}."
         
         # Build conversation history
         messages = [
             {"role": "system", "content": system_context}
         ]
         
-        # Add conversation history (limit to last 10 messages to avoid token overflow)
-        recent_history = request.history[-10:] if len(request.history) > 10 else request.history
+        # Add conversation history, newest first up to the token budget
+        if sum(len(msg.content) for msg in request.history) > _THREADPOOL_HISTORY_CHARS:
+            recent_history = await run_in_threadpool(_truncate_history, request.history)
+        else:
+            recent_history = _truncate_history(request.history)
         for msg in recent_history:
             messages.append({
                 "role": msg.role,
                 "content": msg.content
             })
         
+        if turn_context:
+            messages.append({"role": "system", "content": turn_context.lstrip()})
+        
         # Add current user message
         messages.append({
             "role": "user", 
             "content": request.message
         })
         
-        # Get AI response
-        response = await client.chat.completions.create(
-            model=settings.OPENAI_MODEL,
-            messages=messages,
-            timeout=settings.AI_TIMEOUT,
-            temperature=0.7
-        )
-        
-        ai_message = response.choices[0].message.content
-        
         # Generate suggestions based on context
         suggestions = []
         if request.context_type == "requirement":
@@ -544,6 +927,30 @@ async def chat_with_context(
                 "Generate requirements report"
             ]
         
+        create_kwargs = dict(
+            model=settings.OPENAI_MODEL,
+            messages=messages,
+            timeout=settings.AI_TIMEOUT,
+            temperature=0.7
+        )
+        if request.session_id:
+            create_kwargs["prompt_cache_key"] = request.session_id
+        
+        if stream:
+            # The reply streams as "delta" events; the remaining ChatResponse fields arrive with "done"
+            return _stream_completion(
+                client,
+                lambda: {
+                    "timestamp": datetime.now().isoformat(),
+                    "context_used": context_info,
+                    "suggestions": suggestions
+                },
+                **create_kwargs
+            )
+        
+        # Get AI response
+        ai_message = await openai_call(client, error_label="Chat error", **create_kwargs)
+        
         return ChatResponse(
             message=ai_message,
             timestamp=datetime.now(),
@@ -551,12 +958,114 @@ async def chat_with_context(
             suggestions=suggestions
         )
         
-    except openai.OpenAIError as e:
-        raise HTTPException(status_code=502, detail=f"OpenAI API error: {str(e)}")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Chat error: {str(e)}")
 
 
+# Full-text index over the searchable requirement columns (SQLite FTS5,
+# external content kept in sync by triggers). Built on first search; when the
+# database cannot support it the search falls back to LIKE scans.
+_FTS_COLUMNS = ("id", "title", "description")
+
+_FTS_SETUP = (
+    "CREATE VIRTUAL TABLE requirements_fts USING fts5("
+    "id, title, description, content='requirements', content_rowid='rowid')",
+    "INSERT INTO requirements_fts(requirements_fts) VALUES('rebuild')",
+    "CREATE TRIGGER IF NOT EXISTS requirements_fts_ai AFTER INSERT ON requirements BEGIN "
+    "INSERT INTO requirements_fts(rowid, id, title, description) "
+    "VALUES (new.rowid, new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS requirements_fts_ad AFTER DELETE ON requirements BEGIN "
+    "INSERT INTO requirements_fts(requirements_fts, rowid, id, title, description) "
+    "VALUES ('delete', old.rowid, old.id, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS requirements_fts_au AFTER UPDATE ON requirements BEGIN "
+    "INSERT INTO requirements_fts(requirements_fts, rowid, id, title, description) "
+    "VALUES ('delete', old.rowid, old.id, old.title, old.description); "
+    "INSERT INTO requirements_fts(rowid, id, title, description) "
+    "VALUES (new.rowid, new.id, new.title, new.description); END",
+)
+
+_fts_available: Optional[bool] = None
+_fts_lock = asyncio.Lock()
+
+_FTS_TOKEN_RE = re.compile(r"\w+")
+
+
+def _fts_match_expression(query: str) -> Optional[str]:
+    """Translate a free-text query into an FTS5 prefix match on every term"""
+    terms = _FTS_TOKEN_RE.findall(query)
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+async def _ensure_requirements_fts(db: AsyncSession) -> bool:
+    """Create the requirements FTS index if possible; returns whether it can be used"""
+    global _fts_available
+    
+    if _fts_available is not None:
+        return _fts_available
+    
+    async with _fts_lock:
+        if _fts_available is not None:
+            return _fts_available
+        
+        available = False
+        if db.bind.dialect.name == "sqlite":
+            try:
+                existing = await db.execute(text(
+                    "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'requirements_fts'"
+                ))
+                if existing.first() is not None:
+                    available = True
+                else:
+                    # The triggers would break inserts if a column were missing
+                    columns = {row[1] for row in await db.execute(text("PRAGMA table_info(requirements)"))}
+                    if columns.issuperset(_FTS_COLUMNS):
+                        for statement in _FTS_SETUP:
+                            await db.execute(text(statement))
+                        await db.commit()
+                        _schema_tables_cache.clear()
+                        available = True
+            except Exception as e:
+                await db.rollback()
+                logger.warning(f"Requirements full-text index unavailable: {e}")
+        
+        _fts_available = available
+        return available
+
+
+# Descriptions are cut to their 200-character preview in SQL so full texts never leave the database
+_SEARCH_COLUMNS = (
+    "requirements.id, requirements.title, status, category, criticality, "
+    "CASE WHEN length(requirements.description) > 200 "
+    "THEN substr(requirements.description, 1, 200) || '...' "
+    "ELSE requirements.description END AS description, "
+    "created_at, COUNT(*) OVER () AS total_count"
+)
+
+# bm25() is only usable in the FTS query itself, so rank there and join
+_SEARCH_FTS_SQL = f"""
+    SELECT {_SEARCH_COLUMNS}
+    FROM (SELECT rowid, bm25(requirements_fts) AS rank FROM requirements_fts
+          WHERE requirements_fts MATCH :match) AS hits
+    JOIN requirements ON requirements.rowid = hits.rowid
+    WHERE {{filters}}
+    ORDER BY hits.rank
+    LIMIT :limit
+"""
+
+_SEARCH_LIKE_SQL = f"""
+    SELECT {_SEARCH_COLUMNS}
+    FROM requirements
+    WHERE (requirements.title LIKE :query OR requirements.description LIKE :query OR requirements.id LIKE :query)
+      AND {{filters}}
+    ORDER BY CASE WHEN requirements.title LIKE :query THEN 1 ELSE 2 END, requirements.created_at DESC
+    LIMIT :limit
+"""
+
+
 @router.post("/ai/search-context", response_model=ContextSearchResponse)
 async def search_context(
     request: ContextSearchRequest,
@@ -570,56 +1079,33 @@ async def search_context(
         if request.context_type == "requirement":
             # Search requirements
             filters = request.filters or {}
-            where_clauses = ["(title LIKE :query OR description LIKE :query OR id LIKE :query)"]
-            params = {"query": f"%{request.query}%"}
+            match = _fts_match_expression(request.query)
+            use_fts = match is not None and await _ensure_requirements_fts(db)
             
-            if filters.get("status"):
-                where_clauses.append("status = :status")
-                params["status"] = filters["status"]
-            if filters.get("category"):
-                where_clauses.append("category = :category")
-                params["category"] = filters["category"]
-            if filters.get("criticality"):
-                where_clauses.append("criticality = :criticality")
-                params["criticality"] = filters["criticality"]
+            params = _requirement_filter_params(filters)
+            search_query = _filtered_query(_SEARCH_FTS_SQL if use_fts else _SEARCH_LIKE_SQL, tuple(params))
+            params["limit"] = min(request.limit or 10, 50)  # Max 50 results
             
-            where_clause = " AND ".join(where_clauses)
-            limit = min(request.limit or 10, 50)  # Max 50 results
-            
-            search_query = text(f"""
-                SELECT id, title, status, category, criticality, description, created_at
-                FROM requirements 
-                WHERE {where_clause}
-                ORDER BY 
-                    CASE WHEN title LIKE :exact_query THEN 1 ELSE 2 END,
-                    created_at DESC
-                LIMIT :limit
-            """)
-            
-            params["exact_query"] = f"%{request.query}%"
-            params["limit"] = limit
+            if use_fts:
+                params["match"] = match
+            else:
+                params["query"] = f"%{request.query}%"
             
             result = await db.execute(search_query, params)
-            rows = result.fetchall()
             
-            results = [
-                {
-                    "id": row.id,
-                    "title": row.title,
-                    "status": row.status,
-                    "category": row.category,
-                    "criticality": row.criticality,
-                    "description": row.description[:200] + "..." if len(row.description or "") > 200 else row.description,
-                    "created_at": row.created_at.isoformat() if row.created_at else None,
+            for row in result.mappings():
+                # The window count is computed before LIMIT, so every row carries the full total
+                total_count = row["total_count"]
+                results.append({
+                    "id": row["id"],
+                    "title": row["title"],
+                    "status": row["status"],
+                    "category": row["category"],
+                    "criticality": row["criticality"],
+                    "description": row["description"],
+                    "created_at": row["created_at"].isoformat() if row["created_at"] else None,
                     "type": "requirement"
-                }
-                for row in rows
-            ]
-            
-            # Get total count
-            count_query = text(f"SELECT COUNT(*) FROM requirements WHERE {where_clause}")
-            count_result = await db.execute(count_query, {k: v for k, v in params.items() if k != "limit"})
-            total_count = count_result.scalar()
+                })
         
         return ContextSearchResponse(
             results=results,
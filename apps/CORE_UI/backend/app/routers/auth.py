@@ -2,27 +2,38 @@
 Authentication router for CORE-SE Backend
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from fastapi.security import HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
 from datetime import datetime, timezone
+from email_validator import validate_email, EmailNotValidError
 from typing import List
 
-from ..database import get_db
 from ..models import (
     UserCreate, UserLogin, UserUpdate, UserResponse, Token, 
-    PasswordChange, UserRole, User
+    PasswordChange, UserRole, User, USER_RESPONSE_LIST_ADAPTER
 )
 from ..auth import (
-    hash_password, verify_password, create_token_response, generate_user_id
-)
-from ..dependencies import (
-    get_current_user, get_current_active_user, require_admin,
-    require_role
+    hash_password_async, verify_password_async,
+    create_token_response, generate_user_id, revoke_token, verify_token
 )
+from ..dependencies import get_current_active_user, require_admin, security
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
+_SEEDED_AT = datetime.now(timezone.utc)
+
+# Argon2id hashes of the demo account passwords, precomputed so that starting
+# a worker doesn't pay the KDF cost. Regenerate with scripts/gen_seed_hashes.py.
+SEED_PASSWORD_HASHES = {
+    "admin": "$argon2id$v=19$m=65536,t=3,p=4$+WcdH5pFK/i5GDJTB6R8pw$DyPmi3uS2kIvzaw1LCEsey8BfykovyvFcQKa1KOnUH0",
+    "sys_engineer": "$argon2id$v=19$m=65536,t=3,p=4$WWBbeusC4wZkopBWlxW+LA$S2KKbZDGCf+HRZAZn6dFC9ai3PCXmARqRcOcwxrAW/E",
+    "analyst": "$argon2id$v=19$m=65536,t=3,p=4$I8wJrbhKVBsVKXaWOiHz3A$Z1Vlgg2cZWQTv3y7ncSEi3N7QlQq8So1LY3OB/zeRCg",
+}
+
+# Hash checked when a login names an unknown user, so that failure costs the
+# same KDF work as a wrong password
+DUMMY_PASSWORD_HASH = "$argon2id$v=19$m=65536,t=3,p=4$5BSTRVfT4VyX4+0CZy2L8A$2iP2vmlawQD0z4a/PAGvVgI54ECS9ASehNw04P2iV+A"
+
 # In-memory user store for demo (replace with database operations later)
 demo_users = {
     "admin": {
@@ -30,11 +41,11 @@ demo_users = {
         "username": "admin",
         "email": "admin@aerospace.com",
         "full_name": "Sarah Chen",
-        "hashed_password": hash_password("admin123"),
-        "role": UserRole.ADMIN,
+        "hashed_password": SEED_PASSWORD_HASHES["admin"],
+        "role": "admin",
         "is_active": True,
-        "created_at": datetime.now(timezone.utc),
-        "updated_at": datetime.now(timezone.utc),
+        "created_at": _SEEDED_AT,
+        "updated_at": _SEEDED_AT,
         "last_login": None,
         "first_name": "Sarah",
         "last_name": "Chen",
@@ -52,11 +63,11 @@ demo_users = {
         "username": "sys_engineer",
         "email": "mike.rodriguez@aerospace.com",
         "full_name": "Mike Rodriguez",
-        "hashed_password": hash_password("engineer123"),
-        "role": UserRole.INFLUENCER,
+        "hashed_password": SEED_PASSWORD_HASHES["sys_engineer"],
+        "role": "influencer",
         "is_active": True,
-        "created_at": datetime.now(timezone.utc),
-        "updated_at": datetime.now(timezone.utc),
+        "created_at": _SEEDED_AT,
+        "updated_at": _SEEDED_AT,
         "last_login": None,
         "first_name": "Mike",
         "last_name": "Rodriguez",
@@ -74,11 +85,11 @@ demo_users = {
         "username": "analyst", 
         "email": "alex.kim@aerospace.com",
         "full_name": "Alex Kim",
-        "hashed_password": hash_password("analyst123"),
-        "role": UserRole.CONSUMER,
+        "hashed_password": SEED_PASSWORD_HASHES["analyst"],
+        "role": "consumer",
         "is_active": True,
-        "created_at": datetime.now(timezone.utc),
-        "updated_at": datetime.now(timezone.utc),
+        "created_at": _SEEDED_AT,
+        "updated_at": _SEEDED_AT,
         "last_login": None,
         "first_name": "Alex",
         "last_name": "Kim",
@@ -93,30 +104,57 @@ demo_users = {
     }
 }
 
+# Secondary indexes of the demo user store keyed by user ID and email; every
+# insert into demo_users must also go into these
+demo_users_by_id = {user["id"]: user for user in demo_users.values()}
+demo_users_by_email = {user["email"]: user for user in demo_users.values()}
+
+
+def to_user_response(user: dict) -> UserResponse:
+    """Build a UserResponse from a stored user record without re-validating it"""
+    return UserResponse.model_construct(
+        id=user["id"],
+        email=user["email"],
+        username=user["username"],
+        full_name=user["full_name"],
+        role=user["role"],
+        is_active=user["is_active"],
+        created_at=user["created_at"],
+        last_login=user["last_login"]
+    )
+
 
 @router.post("/register", response_model=Token, status_code=status.HTTP_201_CREATED)
 async def register_user(
-    user_data: UserCreate,
-    db: Session = Depends(get_db)
+    user_data: UserCreate
 ):
     """Register a new user"""
     
+    # Full address validation is only worth its cost on signup
+    try:
+        validate_email(user_data.email, check_deliverability=False)
+    except EmailNotValidError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail=f"Invalid email address: {str(e)}"
+        )
+    
     # Check if username or email already exists
-    for existing_user in demo_users.values():
-        if existing_user["username"] == user_data.username:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Username already registered"
-            )
-        if existing_user["email"] == user_data.email:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already registered"
-            )
+    if user_data.username in demo_users:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Username already registered"
+        )
+    if user_data.email in demo_users_by_email:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
     
     # Create new user
     user_id = generate_user_id()
-    hashed_password = hash_password(user_data.password)
+    hashed_password = await hash_password_async(user_data.password)
+    now = datetime.now(timezone.utc)
     
     new_user = {
         "id": user_id,
@@ -126,8 +164,8 @@ async def register_user(
         "hashed_password": hashed_password,
         "role": user_data.role,
         "is_active": True,
-        "created_at": datetime.now(timezone.utc),
-        "updated_at": datetime.now(timezone.utc),
+        "created_at": now,
+        "updated_at": now,
         "last_login": None,
         "first_name": user_data.first_name,
         "last_name": user_data.last_name,
@@ -143,6 +181,8 @@ async def register_user(
     
     # Store in demo users (replace with database insert)
     demo_users[user_data.username] = new_user
+    demo_users_by_id[user_id] = new_user
+    demo_users_by_email[user_data.email] = new_user
     
     # Create token response
     return create_token_response(new_user)
@@ -150,26 +190,19 @@ async def register_user(
 
 @router.post("/login", response_model=Token)
 async def login_user(
-    login_data: UserLogin,
-    db: Session = Depends(get_db)
+    login_data: UserLogin
 ):
     """Authenticate user and return access token"""
     
-    # Find user by username or email
-    user = None
-    for u in demo_users.values():
-        if u["username"] == login_data.username or u["email"] == login_data.username:
-            user = u
-            break
+    # Find user by username or email (emails are stored lowercased)
+    user = demo_users.get(login_data.username) or demo_users_by_email.get(login_data.username.lower())
     
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect username or password"
-        )
+    # Verify password; unknown users are checked against the dummy hash so
+    # both failures take the same time
+    target_hash = user["hashed_password"] if user else DUMMY_PASSWORD_HASH
+    password_ok = await verify_password_async(login_data.password, target_hash)
     
-    # Verify password
-    if not verify_password(login_data.password, user["hashed_password"]):
+    if not user or not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password"
@@ -194,83 +227,52 @@ async def get_current_user_profile(
     current_user: dict = Depends(get_current_active_user)
 ):
     """Get current user profile"""
-    return UserResponse(
-        id=current_user["id"],
-        email=current_user["email"],
-        username=current_user["username"],
-        full_name=current_user["full_name"],
-        role=current_user["role"],
-        is_active=current_user["is_active"],
-        created_at=current_user["created_at"],
-        last_login=current_user["last_login"]
-    )
+    return to_user_response(current_user)
 
 
 @router.put("/me", response_model=UserResponse)
 async def update_current_user_profile(
     user_update: UserUpdate,
-    current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: dict = Depends(get_current_active_user)
 ):
     """Update current user profile"""
     
     # Find user in demo store
-    user = None
-    for u in demo_users.values():
-        if u["id"] == current_user["id"]:
-            user = u
-            break
+    user = demo_users_by_id.get(current_user["id"])
     
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    # Update fields
-    update_data = user_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        if hasattr(user, field) or field in user:
-            user[field] = value
+    # Update fields; every UserUpdate field is a key of the stored user
+    user.update(user_update.model_dump(exclude_unset=True))
     
     user["updated_at"] = datetime.now(timezone.utc)
     
-    return UserResponse(
-        id=user["id"],
-        email=user["email"],
-        username=user["username"],
-        full_name=user["full_name"],
-        role=user["role"],
-        is_active=user["is_active"],
-        created_at=user["created_at"],
-        last_login=user["last_login"]
-    )
+    return to_user_response(user)
 
 
 @router.post("/change-password")
 async def change_password(
     password_change: PasswordChange,
-    current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: dict = Depends(get_current_active_user)
 ):
     """Change user password"""
     
     # Find user in demo store
-    user = None
-    for u in demo_users.values():
-        if u["id"] == current_user["id"]:
-            user = u
-            break
+    user = demo_users_by_id.get(current_user["id"])
     
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
     # Verify current password
-    if not verify_password(password_change.current_password, user["hashed_password"]):
+    if not await verify_password_async(password_change.current_password, user["hashed_password"]):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect current password"
         )
     
     # Update password
-    user["hashed_password"] = hash_password(password_change.new_password)
+    user["hashed_password"] = await hash_password_async(password_change.new_password)
     user["updated_at"] = datetime.now(timezone.utc)
     
     return {"message": "Password updated successfully"}
@@ -278,42 +280,28 @@ async def change_password(
 
 @router.get("/users", response_model=List[UserResponse])
 async def list_users(
-    current_user: dict = Depends(require_admin),
-    db: Session = Depends(get_db)
+    current_user: dict = Depends(require_admin)
 ):
     """List all users (admin only)"""
+    users = [to_user_response(user) for user in demo_users.values()]
     
-    users = []
-    for user in demo_users.values():
-        users.append(UserResponse(
-            id=user["id"],
-            email=user["email"],
-            username=user["username"],
-            full_name=user["full_name"],
-            role=user["role"],
-            is_active=user["is_active"],
-            created_at=user["created_at"],
-            last_login=user["last_login"]
-        ))
-    
-    return users
+    # Responses are built from the trusted store; skip response_model re-validation
+    return Response(
+        content=USER_RESPONSE_LIST_ADAPTER.dump_json(users),
+        media_type="application/json"
+    )
 
 
 @router.put("/users/{user_id}/role")
 async def update_user_role(
     user_id: str,
     new_role: UserRole,
-    current_user: dict = Depends(require_admin),
-    db: Session = Depends(get_db)
+    current_user: dict = Depends(require_admin)
 ):
     """Update user role (admin only)"""
     
     # Find user
-    target_user = None
-    for u in demo_users.values():
-        if u["id"] == user_id:
-            target_user = u
-            break
+    target_user = demo_users_by_id.get(user_id)
     
     if not target_user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -322,24 +310,19 @@ async def update_user_role(
     target_user["role"] = new_role
     target_user["updated_at"] = datetime.now(timezone.utc)
     
-    return {"message": f"User role updated to {new_role.value}"}
+    return {"message": f"User role updated to {new_role}"}
 
 
 @router.put("/users/{user_id}/status")
 async def toggle_user_status(
     user_id: str,
     is_active: bool,
-    current_user: dict = Depends(require_admin),
-    db: Session = Depends(get_db)
+    current_user: dict = Depends(require_admin)
 ):
     """Activate/deactivate user account (admin only)"""
     
     # Find user
-    target_user = None
-    for u in demo_users.values():
-        if u["id"] == user_id:
-            target_user = u
-            break
+    target_user = demo_users_by_id.get(user_id)
     
     if not target_user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -353,6 +336,11 @@ async def toggle_user_status(
 
 
 @router.post("/logout")
-async def logout_user(current_user: dict = Depends(get_current_active_user)):
-    """Logout user (invalidate token on client side)"""
+async def logout_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+):
+    """Logout user and revoke the token used for this request"""
+    # Only the token itself needs to be valid; the user record isn't involved
+    verify_token(credentials.credentials)
+    revoke_token(credentials.credentials)
     return {"message": "Successfully logged out"}
\ No newline at end of file
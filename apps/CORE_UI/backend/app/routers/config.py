@@ -2,19 +2,19 @@
 Configuration API router
 """
 
-from fastapi import APIRouter
-from app.config import get_settings
+from fastapi import APIRouter, Response
+import orjson
+from typing import Optional, Tuple
+
+from app.config import Settings, get_settings
 from app.models import ConfigResponse
 
 router = APIRouter(tags=["config"])
 
 
-@router.get("/config", response_model=ConfigResponse)
-async def get_config():
-    """Get application configuration and feature flags"""
-    settings = get_settings()
-    
-    return ConfigResponse(
+def build_config_bytes(settings: Settings) -> bytes:
+    """Serialize the configuration response; it only changes when settings do"""
+    config = ConfigResponse(
         features={
             "FEATURE_EMAIL": settings.FEATURE_EMAIL,
             "FEATURE_WINDCHILL": settings.FEATURE_WINDCHILL,
@@ -26,3 +26,25 @@ async def get_config():
         themes=["dark", "light", "custom"],
         mode=settings.MODE
     )
+    return orjson.dumps(config.model_dump())
+
+
+# Serialized payload and the settings object it was built from. Built on first
+# request; when get_settings() hands out a new object (its cache was cleared to
+# reload settings) the payload is rebuilt.
+_config_cache: Optional[Tuple[Settings, bytes]] = None
+
+
+def get_config_bytes() -> bytes:
+    """Cached configuration payload for the current settings"""
+    global _config_cache
+    settings = get_settings()
+    if _config_cache is None or _config_cache[0] is not settings:
+        _config_cache = (settings, build_config_bytes(settings))
+    return _config_cache[1]
+
+
+@router.get("/config", response_model=ConfigResponse)
+async def get_config():
+    """Get application configuration and feature flags"""
+    return Response(content=get_config_bytes(), media_type="application/json")
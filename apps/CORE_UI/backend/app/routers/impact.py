@@ -2,70 +2,63 @@
 Impact Analysis API router
 """
 
-from fastapi import APIRouter, Query, HTTPException, Path
+from fastapi import APIRouter, Depends, Query, HTTPException, Path
 from datetime import datetime
+from typing import Literal, Union
 import httpx
+import orjson
 
 from app.config import get_settings
-from app.models import ImpactResult
+from app.dependencies import get_http_client
+from app.models import ImpactResult, ImpactColumnsResult, ImpactLevelArray, IMPACT_TREE_ADAPTER
+from app.responses import FastJSONResponse
 
 router = APIRouter(tags=["impact"])
 
 
-@router.get("/impact/{entity_id}", response_model=ImpactResult)
+# FDS is trusted and already returns the ImpactResult shape, so the payload is
+# passed through without validation; the schema is documented via responses
+@router.get(
+    "/impact/{entity_id}",
+    response_class=FastJSONResponse,
+    responses={200: {"model": Union[ImpactResult, ImpactColumnsResult]}}
+)
 async def get_impact_analysis(
     entity_id: str = Path(..., description="Entity ID to analyze (e.g., JAMA-REQ-123)"),
-    depth: int = Query(2, ge=1, le=5, description="Analysis depth")
+    depth: int = Query(2, ge=1, le=5, description="Analysis depth"),
+    layout: Literal["tree", "columns"] = Query("tree", description="Return the impact tree nested or as parallel columns"),
+    client: httpx.AsyncClient = Depends(get_http_client)
 ):
     """Get impact analysis for a specific entity"""
     settings = get_settings()
     
     try:
         # Call FDS
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{settings.FDS_BASE_URL}/mock/impact/{entity_id}",
-                params={"depth": depth},
-                timeout=15.0
-            )
-            response.raise_for_status()
-            
-            # Convert FDS response to our model format
-            fds_data = response.json()
-            
-            # Recursively convert impact nodes
-            def convert_impact_node(node_data):
-                return {
-                    "artifact_ref": {
-                        "id": node_data["artifact_ref"]["id"],
-                        "type": node_data["artifact_ref"]["type"],
-                        "source": node_data["artifact_ref"]["source"],
-                        "title": node_data["artifact_ref"]["title"],
-                        "status": node_data["artifact_ref"].get("status"),
-                        "url": node_data["artifact_ref"].get("url")
-                    },
-                    "impact_level": node_data["impact_level"],
-                    "relationship_type": node_data["relationship_type"],
-                    "children": [convert_impact_node(child) for child in node_data.get("children", [])]
-                }
-            
-            impact_result = ImpactResult(
-                root_artifact={
-                    "id": fds_data["root_artifact"]["id"],
-                    "type": fds_data["root_artifact"]["type"],
-                    "source": fds_data["root_artifact"]["source"],
-                    "title": fds_data["root_artifact"]["title"],
-                    "status": fds_data["root_artifact"].get("status"),
-                    "url": fds_data["root_artifact"].get("url")
-                },
-                depth=fds_data["depth"],
-                total_impacted=fds_data["total_impacted"],
-                impact_tree=[convert_impact_node(node) for node in fds_data["impact_tree"]],
-                gap_count=fds_data.get("gap_count", 0)
-            )
-            
-            return impact_result
-            
+        response = await client.get(
+            f"{settings.FDS_BASE_URL}/mock/impact/{entity_id}",
+            params={"depth": depth},
+            timeout=15.0
+        )
+        response.raise_for_status()
+        
+        fds_data = orjson.loads(response.content)
+        
+        result = {
+            "root_artifact": fds_data["root_artifact"],
+            "depth": fds_data["depth"],
+            "total_impacted": fds_data["total_impacted"]
+        }
+        
+        if layout == "columns":
+            # Flattening walks typed nodes, so only this layout validates the tree
+            impact_tree = IMPACT_TREE_ADAPTER.validate_python(fds_data["impact_tree"])
+            result["impact_columns"] = ImpactLevelArray.from_tree(impact_tree)
+        else:
+            result["impact_tree"] = fds_data["impact_tree"]
+        
+        result["gap_count"] = fds_data.get("gap_count", 0)
+        return result
+        
     except httpx.RequestError as e:
         raise HTTPException(status_code=503, detail=f"Failed to connect to FDS: {str(e)}")
     except httpx.HTTPStatusError as e:
@@ -2,15 +2,133 @@
 Knowledge API router - knowledge base search
 """
 
-from fastapi import APIRouter, Query, HTTPException
+from fastapi import APIRouter, Query, HTTPException, Response
+from functools import lru_cache
 from typing import List
 import random
 
-from app.models import KnowledgeCard, ArtifactRef, ArtifactType
+from app.models import ArtifactRef, KnowledgeCard, KNOWLEDGE_CARD_LIST_ADAPTER
 
 router = APIRouter(tags=["knowledge"])
 
 
+# Mock knowledge base entries
+KNOWLEDGE_TOPICS = [
+    {
+        "title": "Systems Engineering Best Practices",
+        "summary": "Comprehensive guide to systems engineering methodologies and practices.",
+        "content": "Systems engineering is an interdisciplinary field that focuses on designing and managing complex systems...",
+        "source": "IEEE Standards",
+        "tags": ["systems", "engineering", "methodology", "standards"]
+    },
+    {
+        "title": "Requirements Traceability Matrix",
+        "summary": "How to maintain traceability between requirements, design, and verification.",
+        "content": "Requirements traceability ensures that each requirement is addressed through design and verified through testing...",
+        "source": "Internal Wiki",
+        "tags": ["requirements", "traceability", "verification", "testing"]
+    },
+    {
+        "title": "Change Management Process",
+        "summary": "Engineering change control and approval workflows.",
+        "content": "Engineering change notices (ECNs) must follow established approval workflows to ensure proper impact assessment...",
+        "source": "Process Documentation",
+        "tags": ["change", "process", "approval", "ECN"]
+    },
+    {
+        "title": "Test Planning and Execution",
+        "summary": "Guidelines for effective test planning and execution strategies.",
+        "content": "Effective test planning begins with understanding requirements and identifying appropriate verification methods...",
+        "source": "Test Guidelines",
+        "tags": ["testing", "verification", "planning", "execution"]
+    },
+    {
+        "title": "Integration Testing Strategies",
+        "summary": "Approaches to integration testing in complex systems.",
+        "content": "Integration testing validates that components work together as intended...",
+        "source": "Technical Manual",
+        "tags": ["integration", "testing", "components", "validation"]
+    }
+]
+
+# Lowercased title, summary, content and tags of each topic, matched against queries
+_TOPIC_TEXT = [
+    (topic["title"].lower(), topic["summary"].lower(), topic["content"].lower(), [tag.lower() for tag in topic["tags"]])
+    for topic in KNOWLEDGE_TOPICS
+]
+
+# Pool of mock related requirements, built once and shared by every card
+_ARTIFACT_POOL = [
+    ArtifactRef.model_construct(
+        id=f"JAMA-REQ-{i:03d}",
+        type="requirement",
+        source="jama",
+        title=f"Related Requirement {i}",
+        status="approved",
+        url=None
+    )
+    for i in range(1, 101)
+]
+
+
+def _related_artifacts(index: int) -> List[ArtifactRef]:
+    """Mock related requirements for a topic, seeded by its position so they never change"""
+    return random.Random(index).sample(_ARTIFACT_POOL, index % 3 + 1)
+
+
+_TOPIC_ARTIFACTS = [_related_artifacts(index) for index in range(len(KNOWLEDGE_TOPICS))]
+
+
+def _score_topic(query_lower: str, index: int) -> int:
+    """Relevance of one topic to the query in basis points"""
+    title, summary, content, tags = _TOPIC_TEXT[index]
+    relevance_bp = 0
+    
+    # Check title relevance
+    if query_lower in title:
+        relevance_bp += 4000
+    
+    # Check summary relevance
+    if query_lower in summary:
+        relevance_bp += 3000
+    
+    # Check content relevance
+    if query_lower in content:
+        relevance_bp += 2000
+    
+    # Check tag relevance
+    for tag in tags:
+        if query_lower in tag:
+            relevance_bp += 1000
+    
+    return relevance_bp
+
+
+@lru_cache(maxsize=1024)
+def _search_knowledge_json(query_lower: str, limit: int) -> bytes:
+    """Serialized knowledge cards for a query; the corpus is fixed, so results are memoized"""
+    scored = [(index, _score_topic(query_lower, index)) for index in range(len(KNOWLEDGE_TOPICS))]
+    
+    # Sort by relevance and limit results
+    relevant_topics = sorted((item for item in scored if item[1] > 0), key=lambda x: x[1], reverse=True)[:limit]
+    
+    knowledge_cards = []
+    for i, (index, score) in enumerate(relevant_topics):
+        topic = KNOWLEDGE_TOPICS[index]
+        knowledge_cards.append(KnowledgeCard(
+            id=f"KB-{i+1:03d}",
+            title=topic["title"],
+            summary=topic["summary"],
+            content=topic["content"],
+            source=topic["source"],
+            tags=topic["tags"],
+            relevance_bp=score,
+            artifact_refs=_TOPIC_ARTIFACTS[index]
+        ))
+    
+    return KNOWLEDGE_CARD_LIST_ADAPTER.dump_json(knowledge_cards)
+
+
 @router.get("/knowledge", response_model=List[KnowledgeCard])
 async def search_knowledge(
     q: str = Query(..., description="Search query"),
@@ -18,105 +136,11 @@ async def search_knowledge(
 ):
     """Search knowledge base"""
     try:
-        # Generate mock knowledge cards based on search query
-        knowledge_cards = []
-        
-        # Mock knowledge base entries
-        knowledge_topics = [
-            {
-                "title": "Systems Engineering Best Practices",
-                "summary": "Comprehensive guide to systems engineering methodologies and practices.",
-                "content": "Systems engineering is an interdisciplinary field that focuses on designing and managing complex systems...",
-                "source": "IEEE Standards",
-                "tags": ["systems", "engineering", "methodology", "standards"]
-            },
-            {
-                "title": "Requirements Traceability Matrix",
-                "summary": "How to maintain traceability between requirements, design, and verification.",
-                "content": "Requirements traceability ensures that each requirement is addressed through design and verified through testing...",
-                "source": "Internal Wiki",
-                "tags": ["requirements", "traceability", "verification", "testing"]
-            },
-            {
-                "title": "Change Management Process",
-                "summary": "Engineering change control and approval workflows.",
-                "content": "Engineering change notices (ECNs) must follow established approval workflows to ensure proper impact assessment...",
-                "source": "Process Documentation",
-                "tags": ["change", "process", "approval", "ECN"]
-            },
-            {
-                "title": "Test Planning and Execution",
-                "summary": "Guidelines for effective test planning and execution strategies.",
-                "content": "Effective test planning begins with understanding requirements and identifying appropriate verification methods...",
-                "source": "Test Guidelines",
-                "tags": ["testing", "verification", "planning", "execution"]
-            },
-            {
-                "title": "Integration Testing Strategies",
-                "summary": "Approaches to integration testing in complex systems.",
-                "content": "Integration testing validates that components work together as intended...",
-                "source": "Technical Manual",
-                "tags": ["integration", "testing", "components", "validation"]
-            }
-        ]
-        
-        # Filter by relevance to search query
-        relevant_topics = []
-        query_lower = q.lower()
-        
-        for topic in knowledge_topics:
-            relevance_score = 0.0
-            
-            # Check title relevance
-            if query_lower in topic["title"].lower():
-                relevance_score += 0.4
-            
-            # Check summary relevance
-            if query_lower in topic["summary"].lower():
-                relevance_score += 0.3
-            
-            # Check content relevance
-            if query_lower in topic["content"].lower():
-                relevance_score += 0.2
-            
-            # Check tag relevance
-            for tag in topic["tags"]:
-                if query_lower in tag.lower():
-                    relevance_score += 0.1
-            
-            if relevance_score > 0:
-                relevant_topics.append((topic, relevance_score))
-        
-        # Sort by relevance and limit results
-        relevant_topics.sort(key=lambda x: x[1], reverse=True)
-        relevant_topics = relevant_topics[:limit]
-        
-        # Convert to KnowledgeCard objects
-        for i, (topic, score) in enumerate(relevant_topics):
-            # Generate some related artifacts
-            artifact_refs = []
-            for j in range(random.randint(1, 3)):
-                artifact_refs.append(ArtifactRef(
-                    id=f"JAMA-REQ-{random.randint(1, 100):03d}",
-                    type=ArtifactType.REQUIREMENT,
-                    source="jama",
-                    title=f"Related Requirement {j+1}",
-                    status="approved"
-                ))
-            
-            card = KnowledgeCard(
-                id=f"KB-{i+1:03d}",
-                title=topic["title"],
-                summary=topic["summary"],
-                content=topic["content"],
-                source=topic["source"],
-                tags=topic["tags"],
-                relevance_score=score,
-                artifact_refs=artifact_refs
-            )
-            knowledge_cards.append(card)
-        
-        return knowledge_cards
+        # Cards are already validated; skip response_model re-validation
+        return Response(
+            content=_search_knowledge_json(q.lower(), limit),
+            media_type="application/json"
+        )
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Knowledge search error: {str(e)}")
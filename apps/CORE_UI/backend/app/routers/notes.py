@@ -6,49 +6,39 @@ from fastapi import APIRouter, HTTPException, Depends, Path
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import List
-from datetime import datetime
+from datetime import datetime, timezone
 import uuid
 
 from app.database import get_db, NoteDB
-from app.models import Note, NoteCreate
+from app.models import Note, NoteCreate, ARTIFACT_LIST_ADAPTER
+from app.responses import FastJSONResponse
 
 router = APIRouter(tags=["notes"])
 
 
+# Columns of a note response, selected directly so rows skip ORM hydration
+_NOTE_COLUMNS = (
+    NoteDB.id, NoteDB.title, NoteDB.body, NoteDB.citations, NoteDB.tags,
+    NoteDB.created_at, NoteDB.updated_at, NoteDB.author
+)
+
+
+def _note_content(row) -> dict:
+    """Response body for a note row; stored citations already have the ArtifactRef shape"""
+    note = dict(row)
+    note["citations"] = note["citations"] or []
+    note["tags"] = note["tags"] or []
+    return note
+
+
 @router.get("/notes", response_model=List[Note])
 async def get_notes(db: AsyncSession = Depends(get_db)):
     """Get all notes"""
     try:
-        result = await db.execute(select(NoteDB).order_by(NoteDB.updated_at.desc()))
-        note_records = result.scalars().all()
-        
-        notes = []
-        for record in note_records:
-            # Convert citations back to proper format
-            citations = []
-            for citation_dict in (record.citations or []):
-                citations.append({
-                    "id": citation_dict["id"],
-                    "type": citation_dict["type"],
-                    "source": citation_dict["source"],
-                    "title": citation_dict["title"],
-                    "status": citation_dict.get("status"),
-                    "url": citation_dict.get("url")
-                })
-            
-            note = Note(
-                id=record.id,
-                title=record.title,
-                body=record.body,
-                citations=citations,
-                tags=record.tags or [],
-                created_at=record.created_at,
-                updated_at=record.updated_at,
-                author=record.author
-            )
-            notes.append(note)
+        result = await db.execute(select(*_NOTE_COLUMNS).order_by(NoteDB.updated_at.desc()))
         
-        return notes
+        # Stored data is returned as-is; skip response_model validation
+        return FastJSONResponse([_note_content(row) for row in result.mappings()])
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
@@ -59,17 +49,8 @@ async def create_note(note_data: NoteCreate, db: AsyncSession = Depends(get_db))
     """Create a new note"""
     try:
         # Convert citations to dict format for JSON storage
-        citations_dict = [
-            {
-                "id": citation.id,
-                "type": citation.type.value,
-                "source": citation.source,
-                "title": citation.title,
-                "status": citation.status,
-                "url": citation.url
-            }
-            for citation in note_data.citations
-        ]
+        citations_dict = ARTIFACT_LIST_ADAPTER.dump_python(note_data.citations, mode="json")
+        now = datetime.now(timezone.utc)
         
         note_record = NoteDB(
             id=str(uuid.uuid4()),
@@ -77,8 +58,8 @@ async def create_note(note_data: NoteCreate, db: AsyncSession = Depends(get_db))
             body=note_data.body,
             citations=citations_dict,
             tags=note_data.tags,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow(),
+            created_at=now,
+            updated_at=now,
             author="demo_user"  # From auth context
         )
         
@@ -86,19 +67,8 @@ async def create_note(note_data: NoteCreate, db: AsyncSession = Depends(get_db))
         await db.commit()
         await db.refresh(note_record)
         
-        # Convert back to response model
-        note = Note(
-            id=note_record.id,
-            title=note_record.title,
-            body=note_record.body,
-            citations=note_data.citations,
-            tags=note_record.tags or [],
-            created_at=note_record.created_at,
-            updated_at=note_record.updated_at,
-            author=note_record.author
-        )
-        
-        return note
+        # Same body as the read endpoints
+        return FastJSONResponse(_note_content({column.key: getattr(note_record, column.key) for column in _NOTE_COLUMNS}))
         
     except Exception as e:
         await db.rollback()
@@ -112,36 +82,13 @@ async def get_note(
 ):
     """Get a specific note by ID"""
     try:
-        result = await db.execute(select(NoteDB).where(NoteDB.id == note_id))
-        note_record = result.scalar_one_or_none()
+        result = await db.execute(select(*_NOTE_COLUMNS).where(NoteDB.id == note_id))
+        row = result.mappings().one_or_none()
         
-        if not note_record:
+        if row is None:
             raise HTTPException(status_code=404, detail="Note not found")
         
-        # Convert citations back to proper format
-        citations = []
-        for citation_dict in (note_record.citations or []):
-            citations.append({
-                "id": citation_dict["id"],
-                "type": citation_dict["type"],
-                "source": citation_dict["source"],
-                "title": citation_dict["title"],
-                "status": citation_dict.get("status"),
-                "url": citation_dict.get("url")
-            })
-        
-        note = Note(
-            id=note_record.id,
-            title=note_record.title,
-            body=note_record.body,
-            citations=citations,
-            tags=note_record.tags or [],
-            created_at=note_record.created_at,
-            updated_at=note_record.updated_at,
-            author=note_record.author
-        )
-        
-        return note
+        return FastJSONResponse(_note_content(row))
         
     except HTTPException:
         raise
@@ -2,23 +2,33 @@
 Pulse API router - aggregated activity feed
 """
 
-from fastapi import APIRouter, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Response
 from typing import Optional, List
 from datetime import datetime
+import asyncio
 import httpx
 
 from app.config import get_settings
-from app.models import PulseItem
+from app.dependencies import get_http_client
+from app.models import PulseItem, PULSE_ITEM_LIST_ADAPTER
 
 router = APIRouter(tags=["pulse"])
 
 
+async def _fetch_pulse(client: httpx.AsyncClient, url: str, params: dict) -> List[PulseItem]:
+    """One FDS pulse request; the whole batch of items is validated in a single pydantic-core call"""
+    response = await client.get(url, params=params, timeout=10.0)
+    response.raise_for_status()
+    return PULSE_ITEM_LIST_ADAPTER.validate_json(response.content)
+
+
 @router.get("/pulse", response_model=List[PulseItem])
 async def get_pulse(
     since: Optional[datetime] = Query(None, description="Show changes since this timestamp"),
     sources: Optional[str] = Query(None, description="Comma-separated source filter (jama,jira,windchill,outlook,email)"),
     types: Optional[str] = Query(None, description="Comma-separated type filter (requirement,test,issue,part,ecn,email,outlook)"),
-    limit: int = Query(50, ge=1, le=200, description="Maximum number of items to return")
+    limit: int = Query(50, ge=1, le=200, description="Maximum number of items to return"),
+    client: httpx.AsyncClient = Depends(get_http_client)
 ):
     """Get aggregated pulse feed from all engineering systems"""
     settings = get_settings()
@@ -36,40 +46,28 @@ async def get_pulse(
         if not settings.FDS_BASE_URL:
             raise HTTPException(status_code=503, detail="FDS is not configured for this mode")
 
-        # Call FDS
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{settings.FDS_BASE_URL}/mock/pulse",
-                params=params,
-                timeout=10.0
-            )
-            response.raise_for_status()
-            
-            # Convert FDS response to our model format
-            fds_data = response.json()
-            pulse_items = []
-            
-            for item in fds_data:
-                # Convert MockPulseItem to PulseItem
-                pulse_item = PulseItem(
-                    id=item["id"],
-                    artifact_ref={
-                        "id": item["artifact_ref"]["id"],
-                        "type": item["artifact_ref"]["type"],
-                        "source": item["artifact_ref"]["source"],
-                        "title": item["artifact_ref"]["title"],
-                        "status": item["artifact_ref"].get("status"),
-                        "url": item["artifact_ref"].get("url")
-                    },
-                    change_type=item["change_type"],
-                    change_summary=item["change_summary"],
-                    timestamp=datetime.fromisoformat(item["timestamp"].replace("Z", "+00:00")),
-                    author=item.get("author"),
-                    metadata=item.get("metadata", {})
-                )
-                pulse_items.append(pulse_item)
-            
-            return pulse_items
+        # Call FDS; several sources are fetched concurrently, one request each,
+        # and merged newest-first
+        url = f"{settings.FDS_BASE_URL}/mock/pulse"
+        source_list = [source.strip() for source in sources.split(",") if source.strip()] if sources else []
+        
+        if len(source_list) > 1:
+            batches = await asyncio.gather(*(
+                _fetch_pulse(client, url, {**params, "sources": source}) for source in source_list
+            ))
+            pulse_items = sorted(
+                (item for batch in batches for item in batch),
+                key=lambda item: item.timestamp,
+                reverse=True
+            )[:limit]
+        else:
+            pulse_items = await _fetch_pulse(client, url, params)
+        
+        # Items are already validated; skip response_model re-validation
+        return Response(
+            content=PULSE_ITEM_LIST_ADAPTER.dump_json(pulse_items),
+            media_type="application/json"
+        )
             
     except httpx.RequestError as e:
         raise HTTPException(status_code=503, detail=f"Failed to connect to FDS: {str(e)}")
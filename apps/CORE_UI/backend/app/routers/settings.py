@@ -6,14 +6,22 @@ from fastapi import APIRouter, Depends, HTTPException
 from typing import Dict, Any, List, Optional
 from pydantic import BaseModel, Field
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.dependencies import get_current_user
 from app.models import User
 from app.database import get_db, UserSettingsDB
-from datetime import datetime
+from datetime import datetime, timezone
 
 router = APIRouter(tags=["settings"])
 
+# INSERT constructs that support ON CONFLICT, for the databases the app runs on
+_DIALECT_INSERTS = {
+    "sqlite": sqlite_insert,
+    "postgresql": postgresql_insert,
+}
+
 
 class AIPromptSettings(BaseModel):
     """AI prompt configuration"""
@@ -58,48 +66,80 @@ class ProfileUpdate(BaseModel):
     timezone: Optional[str] = None
 
 
+async def get_user_settings_db(
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> Optional[UserSettingsDB]:
+    """
+    Current user's stored settings row, or None if they have none yet.
+    FastAPI caches dependencies per request, so the row is fetched once however
+    many dependents ask for it.
+    """
+    result = await db.execute(
+        select(UserSettingsDB).where(UserSettingsDB.user_id == current_user["id"])
+    )
+    return result.scalar_one_or_none()
+
+
+# Stored rows were validated on the way in, so the section models are built
+# without validating them again
+
+def _ai_prompt_settings(settings_db: UserSettingsDB) -> AIPromptSettings:
+    return AIPromptSettings.model_construct(
+        domain_focus=settings_db.domain_focus or ["interfaces", "electrical"],
+        response_style=settings_db.response_style,
+        analysis_depth=settings_db.analysis_depth,
+        custom_system_prompt=settings_db.custom_system_prompt or "",
+        relationship_prompt=settings_db.relationship_prompt or "",
+        impact_prompt=settings_db.impact_prompt or ""
+    )
+
+
+def _display_settings(settings_db: UserSettingsDB) -> DisplaySettings:
+    return DisplaySettings.model_construct(
+        theme=settings_db.theme,
+        density=settings_db.density,
+        animations=settings_db.animations
+    )
+
+
+def _notification_settings(settings_db: UserSettingsDB) -> NotificationSettings:
+    return NotificationSettings.model_construct(
+        email_notifications=settings_db.email_notifications,
+        push_notifications=settings_db.push_notifications,
+        pulse_updates=settings_db.pulse_updates,
+        task_reminders=settings_db.task_reminders
+    )
+
+
+async def _save_settings(db: AsyncSession, user_id: str, values: Dict[str, Any]) -> None:
+    """Insert or update the given columns of a user's row in one statement"""
+    values["updated_at"] = datetime.now(timezone.utc)
+    insert = _DIALECT_INSERTS[db.bind.dialect.name]
+    await db.execute(
+        insert(UserSettingsDB)
+        .values(user_id=user_id, **values)
+        .on_conflict_do_update(index_elements=[UserSettingsDB.user_id], set_=values)
+    )
+    await db.commit()
+
+
 @router.get("/settings")
 async def get_settings(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    settings_db: Optional[UserSettingsDB] = Depends(get_user_settings_db)
 ) -> UserSettings:
     """
     Get current user's settings from database.
     Returns default settings if none exist.
     """
-    user_id = current_user.id
-    
-    # Query database for user settings
-    result = await db.execute(
-        select(UserSettingsDB).where(UserSettingsDB.user_id == user_id)
-    )
-    settings_db = result.scalar_one_or_none()
-    
     # If no settings exist, return defaults
     if not settings_db:
         return UserSettings()
     
-    # Convert database model to pydantic model
-    return UserSettings(
-        ai_prompts=AIPromptSettings(
-            domain_focus=settings_db.domain_focus or ["interfaces", "electrical"],
-            response_style=settings_db.response_style,
-            analysis_depth=settings_db.analysis_depth,
-            custom_system_prompt=settings_db.custom_system_prompt or "",
-            relationship_prompt=settings_db.relationship_prompt or "",
-            impact_prompt=settings_db.impact_prompt or ""
-        ),
-        display=DisplaySettings(
-            theme=settings_db.theme,
-            density=settings_db.density,
-            animations=settings_db.animations
-        ),
-        notifications=NotificationSettings(
-            email_notifications=settings_db.email_notifications,
-            push_notifications=settings_db.push_notifications,
-            pulse_updates=settings_db.pulse_updates,
-            task_reminders=settings_db.task_reminders
-        ),
+    return UserSettings.model_construct(
+        ai_prompts=_ai_prompt_settings(settings_db),
+        display=_display_settings(settings_db),
+        notifications=_notification_settings(settings_db),
         timezone=settings_db.timezone,
         language=settings_db.language
     )
@@ -108,62 +148,19 @@ async def get_settings(
 @router.put("/settings")
 async def update_settings(
     settings: UserSettings,
-    current_user: User = Depends(get_current_user),
+    current_user: dict = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ) -> Dict[str, Any]:
     """
     Update user settings in database.
     """
-    user_id = current_user.id
-    
-    # Check if settings exist
-    result = await db.execute(
-        select(UserSettingsDB).where(UserSettingsDB.user_id == user_id)
-    )
-    settings_db = result.scalar_one_or_none()
-    
-    if settings_db:
-        # Update existing settings
-        settings_db.domain_focus = settings.ai_prompts.domain_focus
-        settings_db.response_style = settings.ai_prompts.response_style
-        settings_db.analysis_depth = settings.ai_prompts.analysis_depth
-        settings_db.custom_system_prompt = settings.ai_prompts.custom_system_prompt
-        settings_db.relationship_prompt = settings.ai_prompts.relationship_prompt
-        settings_db.impact_prompt = settings.ai_prompts.impact_prompt
-        settings_db.theme = settings.display.theme
-        settings_db.density = settings.display.density
-        settings_db.animations = settings.display.animations
-        settings_db.email_notifications = settings.notifications.email_notifications
-        settings_db.push_notifications = settings.notifications.push_notifications
-        settings_db.pulse_updates = settings.notifications.pulse_updates
-        settings_db.task_reminders = settings.notifications.task_reminders
-        settings_db.timezone = settings.timezone
-        settings_db.language = settings.language
-        settings_db.updated_at = datetime.utcnow()
-    else:
-        # Create new settings
-        settings_db = UserSettingsDB(
-            user_id=user_id,
-            domain_focus=settings.ai_prompts.domain_focus,
-            response_style=settings.ai_prompts.response_style,
-            analysis_depth=settings.ai_prompts.analysis_depth,
-            custom_system_prompt=settings.ai_prompts.custom_system_prompt,
-            relationship_prompt=settings.ai_prompts.relationship_prompt,
-            impact_prompt=settings.ai_prompts.impact_prompt,
-            theme=settings.display.theme,
-            density=settings.display.density,
-            animations=settings.display.animations,
-            email_notifications=settings.notifications.email_notifications,
-            push_notifications=settings.notifications.push_notifications,
-            pulse_updates=settings.notifications.pulse_updates,
-            task_reminders=settings.notifications.task_reminders,
-            timezone=settings.timezone,
-            language=settings.language
-        )
-        db.add(settings_db)
-    
-    await db.commit()
-    await db.refresh(settings_db)
+    await _save_settings(db, current_user["id"], {
+        **settings.ai_prompts.model_dump(),
+        **settings.display.model_dump(),
+        **settings.notifications.model_dump(),
+        "timezone": settings.timezone,
+        "language": settings.language
+    })
     
     return {
         "message": "Settings updated successfully",
@@ -173,35 +170,27 @@ async def update_settings(
 
 @router.get("/settings/ai-prompts")
 async def get_ai_prompt_settings(
-    current_user: User = Depends(get_current_user)
+    settings_db: Optional[UserSettingsDB] = Depends(get_user_settings_db)
 ) -> AIPromptSettings:
     """
     Get AI prompt settings only.
     """
-    user_id = current_user.id
-    
-    if user_id not in user_settings_store:
+    if not settings_db:
         return AIPromptSettings()
     
-    return user_settings_store[user_id].ai_prompts
+    return _ai_prompt_settings(settings_db)
 
 
 @router.put("/settings/ai-prompts")
 async def update_ai_prompt_settings(
     ai_prompts: AIPromptSettings,
-    current_user: User = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ) -> Dict[str, Any]:
     """
     Update AI prompt settings only.
     """
-    user_id = current_user.id
-    
-    # Get or create settings
-    if user_id not in user_settings_store:
-        user_settings_store[user_id] = UserSettings()
-    
-    # Update AI prompts
-    user_settings_store[user_id].ai_prompts = ai_prompts
+    await _save_settings(db, current_user["id"], ai_prompts.model_dump())
     
     return {
         "message": "AI prompt settings updated successfully",
@@ -211,33 +200,27 @@ async def update_ai_prompt_settings(
 
 @router.get("/settings/display")
 async def get_display_settings(
-    current_user: User = Depends(get_current_user)
+    settings_db: Optional[UserSettingsDB] = Depends(get_user_settings_db)
 ) -> DisplaySettings:
     """
     Get display settings only.
     """
-    user_id = current_user.id
-    
-    if user_id not in user_settings_store:
+    if not settings_db:
         return DisplaySettings()
     
-    return user_settings_store[user_id].display
+    return _display_settings(settings_db)
 
 
 @router.put("/settings/display")
 async def update_display_settings(
     display: DisplaySettings,
-    current_user: User = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ) -> Dict[str, Any]:
     """
     Update display settings only.
     """
-    user_id = current_user.id
-    
-    if user_id not in user_settings_store:
-        user_settings_store[user_id] = UserSettings()
-    
-    user_settings_store[user_id].display = display
+    await _save_settings(db, current_user["id"], display.model_dump())
     
     return {
         "message": "Display settings updated successfully",
@@ -247,33 +230,27 @@ async def update_display_settings(
 
 @router.get("/settings/notifications")
 async def get_notification_settings(
-    current_user: User = Depends(get_current_user)
+    settings_db: Optional[UserSettingsDB] = Depends(get_user_settings_db)
 ) -> NotificationSettings:
     """
     Get notification settings only.
     """
-    user_id = current_user.id
-    
-    if user_id not in user_settings_store:
+    if not settings_db:
         return NotificationSettings()
     
-    return user_settings_store[user_id].notifications
+    return _notification_settings(settings_db)
 
 
 @router.put("/settings/notifications")
 async def update_notification_settings(
     notifications: NotificationSettings,
-    current_user: User = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ) -> Dict[str, Any]:
     """
     Update notification settings only.
     """
-    user_id = current_user.id
-    
-    if user_id not in user_settings_store:
-        user_settings_store[user_id] = UserSettings()
-    
-    user_settings_store[user_id].notifications = notifications
+    await _save_settings(db, current_user["id"], notifications.model_dump())
     
     return {
         "message": "Notification settings updated successfully",
@@ -300,7 +277,7 @@ async def update_profile(
     # TODO: Update user in database
     # For now, just return success
     
-    updated_fields = {k: v for k, v in profile_update.dict(exclude_unset=True).items() if v is not None}
+    updated_fields = profile_update.model_dump(exclude_unset=True, exclude_none=True)
     
     return {
         "message": "Profile updated successfully",
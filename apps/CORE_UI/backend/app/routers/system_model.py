@@ -4,12 +4,16 @@ Provides endpoints for system model visualization
 """
 
 from fastapi import APIRouter, HTTPException
-from typing import Optional, List, Dict, Any
+from collections import defaultdict, deque
+from typing import Optional, List, Dict, Any, Tuple
 import logging
 
+from app.responses import FastJSONResponse
+
 logger = logging.getLogger(__name__)
 
-router = APIRouter(tags=["system-model"])
+# Slice responses are large untyped dicts, so render them with orjson
+router = APIRouter(tags=["system-model"], default_response_class=FastJSONResponse)
 
 
 @router.get("/system-model/root-slice")
@@ -87,6 +91,100 @@ async def get_slice(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Mock system model; the data is static, so it and its adjacency are built once
+# and slices share references to these dicts
+_ALL_NODES: Tuple[Dict[str, Any], ...] = (
+    {
+        "id": "SYS-1",
+        "label": "Aerospace System",
+        "type": "system",
+        "metadata": {"discipline": "Systems Engineering"}
+    },
+    {
+        "id": "SS-flight-control",
+        "label": "Flight Control",
+        "type": "subsystem",
+        "metadata": {}
+    },
+    {
+        "id": "SS-avionics",
+        "label": "Avionics",
+        "type": "subsystem",
+        "metadata": {}
+    },
+    {
+        "id": "SS-propulsion",
+        "label": "Propulsion",
+        "type": "subsystem",
+        "metadata": {}
+    },
+    {
+        "id": "SS-landing-gear",
+        "label": "Landing Gear",
+        "type": "subsystem",
+        "metadata": {}
+    },
+    {
+        "id": "SS-eclss",
+        "label": "ECLSS",
+        "type": "subsystem",
+        "metadata": {}
+    },
+    {
+        "id": "SS-communication",
+        "label": "Communication",
+        "type": "subsystem",
+        "metadata": {}
+    },
+    {
+        "id": "SS-hydraulics",
+        "label": "Hydraulics",
+        "type": "subsystem",
+        "metadata": {}
+    },
+    {
+        "id": "SS-fuel-system",
+        "label": "Fuel System",
+        "type": "subsystem",
+        "metadata": {}
+    },
+    {
+        "id": "SS-safety-systems",
+        "label": "Safety Systems",
+        "type": "subsystem",
+        "metadata": {}
+    },
+    {
+        "id": "SS-electrical",
+        "label": "Electrical",
+        "type": "subsystem",
+        "metadata": {}
+    }
+)
+
+_ALL_EDGES: Tuple[Dict[str, Any], ...] = (
+    {"id": "e1", "from": "SYS-1", "to": "SS-flight-control", "relation": "CONTAINS", "metadata": {}},
+    {"id": "e2", "from": "SYS-1", "to": "SS-avionics", "relation": "CONTAINS", "metadata": {}},
+    {"id": "e3", "from": "SYS-1", "to": "SS-propulsion", "relation": "CONTAINS", "metadata": {}},
+    {"id": "e4", "from": "SYS-1", "to": "SS-landing-gear", "relation": "CONTAINS", "metadata": {}},
+    {"id": "e5", "from": "SYS-1", "to": "SS-eclss", "relation": "CONTAINS", "metadata": {}},
+    {"id": "e6", "from": "SYS-1", "to": "SS-communication", "relation": "CONTAINS", "metadata": {}},
+    {"id": "e7", "from": "SYS-1", "to": "SS-hydraulics", "relation": "CONTAINS", "metadata": {}},
+    {"id": "e8", "from": "SYS-1", "to": "SS-fuel-system", "relation": "CONTAINS", "metadata": {}},
+    {"id": "e9", "from": "SYS-1", "to": "SS-safety-systems", "relation": "CONTAINS", "metadata": {}},
+    {"id": "e10", "from": "SYS-1", "to": "SS-electrical", "relation": "CONTAINS", "metadata": {}},
+    {"id": "e11", "from": "SS-avionics", "to": "SS-flight-control", "relation": "INTERFACES", "metadata": {}},
+    {"id": "e12", "from": "SS-propulsion", "to": "SS-flight-control", "relation": "INTERFACES", "metadata": {}}
+)
+
+# Adjacency lists in both directions, so each hop only visits incident edges
+_ADJACENCY: Dict[str, List[Tuple[Dict[str, Any], str]]] = defaultdict(list)
+for _edge in _ALL_EDGES:
+    _ADJACENCY[_edge["from"]].append((_edge, _edge["to"]))
+    _ADJACENCY[_edge["to"]].append((_edge, _edge["from"]))
+del _edge
+
+
 def get_mock_system_slice(
     radius: int = 1,
     include_types: Optional[List[str]] = None,
@@ -98,116 +196,31 @@ def get_mock_system_slice(
     if not entity_ids:
         entity_ids = ["SYS-1"]
     
-    # Mock system model
-    all_nodes = [
-        {
-            "id": "SYS-1",
-            "label": "Aerospace System",
-            "type": "system",
-            "metadata": {"discipline": "Systems Engineering"}
-        },
-        {
-            "id": "SS-flight-control",
-            "label": "Flight Control",
-            "type": "subsystem",
-            "metadata": {}
-        },
-        {
-            "id": "SS-avionics",
-            "label": "Avionics",
-            "type": "subsystem",
-            "metadata": {}
-        },
-        {
-            "id": "SS-propulsion",
-            "label": "Propulsion",
-            "type": "subsystem",
-            "metadata": {}
-        },
-        {
-            "id": "SS-landing-gear",
-            "label": "Landing Gear",
-            "type": "subsystem",
-            "metadata": {}
-        },
-        {
-            "id": "SS-eclss",
-            "label": "ECLSS",
-            "type": "subsystem",
-            "metadata": {}
-        },
-        {
-            "id": "SS-communication",
-            "label": "Communication",
-            "type": "subsystem",
-            "metadata": {}
-        },
-        {
-            "id": "SS-hydraulics",
-            "label": "Hydraulics",
-            "type": "subsystem",
-            "metadata": {}
-        },
-        {
-            "id": "SS-fuel-system",
-            "label": "Fuel System",
-            "type": "subsystem",
-            "metadata": {}
-        },
-        {
-            "id": "SS-safety-systems",
-            "label": "Safety Systems",
-            "type": "subsystem",
-            "metadata": {}
-        },
-        {
-            "id": "SS-electrical",
-            "label": "Electrical",
-            "type": "subsystem",
-            "metadata": {}
-        }
-    ]
-    
-    all_edges = [
-        {"id": "e1", "from": "SYS-1", "to": "SS-flight-control", "relation": "CONTAINS", "metadata": {}},
-        {"id": "e2", "from": "SYS-1", "to": "SS-avionics", "relation": "CONTAINS", "metadata": {}},
-        {"id": "e3", "from": "SYS-1", "to": "SS-propulsion", "relation": "CONTAINS", "metadata": {}},
-        {"id": "e4", "from": "SYS-1", "to": "SS-landing-gear", "relation": "CONTAINS", "metadata": {}},
-        {"id": "e5", "from": "SYS-1", "to": "SS-eclss", "relation": "CONTAINS", "metadata": {}},
-        {"id": "e6", "from": "SYS-1", "to": "SS-communication", "relation": "CONTAINS", "metadata": {}},
-        {"id": "e7", "from": "SYS-1", "to": "SS-hydraulics", "relation": "CONTAINS", "metadata": {}},
-        {"id": "e8", "from": "SYS-1", "to": "SS-fuel-system", "relation": "CONTAINS", "metadata": {}},
-        {"id": "e9", "from": "SYS-1", "to": "SS-safety-systems", "relation": "CONTAINS", "metadata": {}},
-        {"id": "e10", "from": "SYS-1", "to": "SS-electrical", "relation": "CONTAINS", "metadata": {}},
-        {"id": "e11", "from": "SS-avionics", "to": "SS-flight-control", "relation": "INTERFACES", "metadata": {}},
-        {"id": "e12", "from": "SS-propulsion", "to": "SS-flight-control", "relation": "INTERFACES", "metadata": {}}
-    ]
-    
-    # Simple traversal
+    # Breadth-first traversal; nodes up to radius hops out are expanded, which
+    # also pulls in their neighbours one hop further
     included_node_ids = set(entity_ids)
+    included_edge_ids = set()
     included_edges = []
-    
-    # Traverse outward
-    for i in range(radius + 1):
-        current_nodes = list(included_node_ids)
-        for node_id in current_nodes:
-            for edge in all_edges:
-                if edge["from"] == node_id:
-                    included_node_ids.add(edge["to"])
-                    if edge not in included_edges:
-                        included_edges.append(edge)
-                if edge["to"] == node_id:
-                    included_node_ids.add(edge["from"])
-                    if edge not in included_edges:
-                        included_edges.append(edge)
+    frontier = deque((node_id, 0) for node_id in dict.fromkeys(entity_ids)) if radius >= 0 else deque()
+    while frontier:
+        node_id, depth = frontier.popleft()
+        for edge, neighbor_id in _ADJACENCY.get(node_id, ()):
+            if edge["id"] not in included_edge_ids:
+                included_edge_ids.add(edge["id"])
+                included_edges.append(edge)
+            if neighbor_id not in included_node_ids:
+                included_node_ids.add(neighbor_id)
+                if depth < radius:
+                    frontier.append((neighbor_id, depth + 1))
     
     # Filter nodes
-    nodes = [n for n in all_nodes if n["id"] in included_node_ids]
+    nodes = [n for n in _ALL_NODES if n["id"] in included_node_ids]
     
     # Apply type filter
     if include_types:
-        nodes = [n for n in nodes if n["type"] in include_types]
-        included_ids = set(n["id"] for n in nodes)
+        include_types_set = set(include_types)
+        nodes = [n for n in nodes if n["type"] in include_types_set]
+        included_ids = {n["id"] for n in nodes}
         included_edges = [e for e in included_edges if e["from"] in included_ids and e["to"] in included_ids]
     
     summary = f"Found {len(nodes)} nodes and {len(included_edges)} edges around {', '.join(entity_ids)} with radius {radius}"
@@ -2,66 +2,87 @@
 Tasks API router - manage engineering tasks
 """
 
-from fastapi import APIRouter, HTTPException, Depends, Path
+from fastapi import APIRouter, HTTPException, Depends, Path, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete
-from typing import List
-from datetime import datetime
+from sqlalchemy import select, update, delete, insert
+from typing import List, Optional
+from datetime import datetime, timezone
 import uuid
 
-from app.database import get_db, TaskDB
-from app.models import Task, TaskCreate, TaskUpdate
+from app.database import get_db, TaskDB, TaskSubtaskDB
+from app.models import Task, TaskCreate, TaskUpdate, ARTIFACT_LIST_ADAPTER, TASK_LIST_ADAPTER, artifact_ref
+from app.responses import FastJSONResponse
 
 router = APIRouter(tags=["tasks"])
 
+# Shared empty list for tasks without context artifacts; never mutated
+_EMPTY: list = []
 
-@router.get("/tasks", response_model=List[Task])
+
+def _artifacts(stored: Optional[list]) -> list:
+    """Shared ArtifactRefs for a task's stored context_artifacts dicts"""
+    if not stored:
+        return _EMPTY
+    return [
+        artifact_ref(a["id"], a["type"], a["source"], a["title"], a.get("status"), a.get("url"))
+        for a in stored
+    ]
+
+
+def _task_response(task: Task) -> Response:
+    """Serialize a task the handler already validated.
+
+    The single-task routes document Task via responses= rather than
+    response_model, so FastAPI does not validate the model a second time.
+    """
+    return Response(content=task.model_dump_json(), media_type="application/json")
+
+
+@router.get("/tasks", responses={200: {"model": List[Task]}})
 async def get_tasks(db: AsyncSession = Depends(get_db)):
     """Get all tasks"""
     try:
         result = await db.execute(select(TaskDB))
         task_records = result.scalars().all()
         
-        tasks = []
-        for record in task_records:
-            task = Task(
-                id=record.id,
-                title=record.title,
-                description=record.description,
-                status=record.status,
-                priority=record.priority,
-                assignee=record.assignee,
-                due_date=record.due_date,
-                created_at=record.created_at,
-                updated_at=record.updated_at,
-                context_artifacts=record.context_artifacts or [],
-                subtasks=record.subtasks or []
+        # Stored rows were validated on write, so build the models without re-validating
+        tasks = [
+            Task.model_construct(
+                id=r.id,
+                title=r.title,
+                description=r.description,
+                status=r.status,
+                priority=r.priority,
+                assignee=r.assignee,
+                due_date=r.due_date,
+                created_at=r.created_at,
+                updated_at=r.updated_at,
+                context_artifacts=_artifacts(r.context_artifacts),
+                subtasks=tuple(r.subtask_list)
             )
-            tasks.append(task)
+            for r in task_records
+        ]
         
-        return tasks
+        # Serialized straight to bytes by Pydantic; no response_model re-validation
+        return Response(
+            content=TASK_LIST_ADAPTER.dump_json(tasks),
+            media_type="application/json"
+        )
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
 
-@router.post("/tasks", response_model=Task)
+@router.post("/tasks", responses={200: {"model": Task}})
 async def create_task(task_data: TaskCreate, db: AsyncSession = Depends(get_db)):
     """Create a new task"""
     try:
         # Convert context_artifacts to dict format for JSON storage
-        context_artifacts_dict = [
-            {
-                "id": artifact.id,
-                "type": artifact.type.value,
-                "source": artifact.source,
-                "title": artifact.title,
-                "status": artifact.status,
-                "url": artifact.url
-            }
-            for artifact in task_data.context_artifacts
-        ]
+        context_artifacts_dict = ARTIFACT_LIST_ADAPTER.dump_python(
+            task_data.context_artifacts, mode="json"
+        )
         
+        now = datetime.now(timezone.utc)
         task_record = TaskDB(
             id=str(uuid.uuid4()),
             title=task_data.title,
@@ -69,8 +90,8 @@ async def create_task(task_data: TaskCreate, db: AsyncSession = Depends(get_db))
             priority=task_data.priority,
             assignee=task_data.assignee,
             due_date=task_data.due_date,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow(),
+            created_at=now,
+            updated_at=now,
             context_artifacts=context_artifacts_dict,
             subtasks=[]
         )
@@ -91,17 +112,17 @@ async def create_task(task_data: TaskCreate, db: AsyncSession = Depends(get_db))
             created_at=task_record.created_at,
             updated_at=task_record.updated_at,
             context_artifacts=task_data.context_artifacts,
-            subtasks=task_record.subtasks or []
+            subtasks=task_record.subtask_list
         )
         
-        return task
+        return _task_response(task)
         
     except Exception as e:
         await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to create task: {str(e)}")
 
 
-@router.patch("/tasks/{task_id}", response_model=Task)
+@router.patch("/tasks/{task_id}", responses={200: {"model": Task}})
 async def update_task(
     task_id: str = Path(..., description="Task ID"),
     task_update: TaskUpdate = ...,
@@ -109,13 +130,6 @@ async def update_task(
 ):
     """Update an existing task"""
     try:
-        # Get existing task
-        result = await db.execute(select(TaskDB).where(TaskDB.id == task_id))
-        task_record = result.scalar_one_or_none()
-        
-        if not task_record:
-            raise HTTPException(status_code=404, detail="Task not found")
-        
         # Update fields
         update_data = {}
         if task_update.title is not None:
@@ -123,7 +137,7 @@ async def update_task(
         if task_update.description is not None:
             update_data["description"] = task_update.description
         if task_update.status is not None:
-            update_data["status"] = task_update.status.value
+            update_data["status"] = task_update.status
         if task_update.priority is not None:
             update_data["priority"] = task_update.priority
         if task_update.assignee is not None:
@@ -131,59 +145,40 @@ async def update_task(
         if task_update.due_date is not None:
             update_data["due_date"] = task_update.due_date
         if task_update.subtasks is not None:
-            update_data["subtasks"] = task_update.subtasks
+            update_data["subtasks"] = list(task_update.subtasks)
         
         if update_data:
-            update_data["updated_at"] = datetime.utcnow()
+            update_data["updated_at"] = datetime.now(timezone.utc)
             
-            await db.execute(
-                update(TaskDB).where(TaskDB.id == task_id).values(**update_data)
+            # Update and read back the row in a single round trip
+            result = await db.execute(
+                update(TaskDB).where(TaskDB.id == task_id).values(**update_data).returning(TaskDB)
             )
-            await db.commit()
+            task_record = result.scalar_one_or_none()
             
-            # Get updated record
-            result = await db.execute(select(TaskDB).where(TaskDB.id == task_id))
-            updated_record = result.scalar_one()
+            if not task_record:
+                raise HTTPException(status_code=404, detail="Task not found")
             
-            # Convert context_artifacts back to proper format
-            context_artifacts = []
-            for artifact_dict in (updated_record.context_artifacts or []):
-                context_artifacts.append({
-                    "id": artifact_dict["id"],
-                    "type": artifact_dict["type"],
-                    "source": artifact_dict["source"],
-                    "title": artifact_dict["title"],
-                    "status": artifact_dict.get("status"),
-                    "url": artifact_dict.get("url")
-                })
+            if task_update.subtasks is not None:
+                await db.execute(delete(TaskSubtaskDB).where(TaskSubtaskDB.task_id == task_id))
+                if task_update.subtasks:
+                    await db.execute(insert(TaskSubtaskDB), [
+                        {"task_id": task_id, "position": position, "text": text}
+                        for position, text in enumerate(task_update.subtasks)
+                    ])
+                subtasks = update_data["subtasks"]
+            else:
+                subtasks = task_record.subtask_list
             
-            task = Task(
-                id=updated_record.id,
-                title=updated_record.title,
-                description=updated_record.description,
-                status=updated_record.status,
-                priority=updated_record.priority,
-                assignee=updated_record.assignee,
-                due_date=updated_record.due_date,
-                created_at=updated_record.created_at,
-                updated_at=updated_record.updated_at,
-                context_artifacts=context_artifacts,
-                subtasks=updated_record.subtasks or []
-            )
+            await db.commit()
+        else:
+            # No updates provided, return existing task
+            task_record = await db.get(TaskDB, task_id)
             
-            return task
-        
-        # No updates provided, return existing task
-        context_artifacts = []
-        for artifact_dict in (task_record.context_artifacts or []):
-            context_artifacts.append({
-                "id": artifact_dict["id"],
-                "type": artifact_dict["type"],
-                "source": artifact_dict["source"],
-                "title": artifact_dict["title"],
-                "status": artifact_dict.get("status"),
-                "url": artifact_dict.get("url")
-            })
+            if not task_record:
+                raise HTTPException(status_code=404, detail="Task not found")
+            
+            subtasks = task_record.subtask_list
         
         task = Task(
             id=task_record.id,
@@ -195,11 +190,11 @@ async def update_task(
             due_date=task_record.due_date,
             created_at=task_record.created_at,
             updated_at=task_record.updated_at,
-            context_artifacts=context_artifacts,
-            subtasks=task_record.subtasks or []
+            context_artifacts=_artifacts(task_record.context_artifacts),
+            subtasks=subtasks
         )
         
-        return task
+        return _task_response(task)
         
     except HTTPException:
         raise
@@ -208,15 +203,14 @@ async def update_task(
         raise HTTPException(status_code=500, detail=f"Failed to update task: {str(e)}")
 
 
-@router.delete("/tasks/{task_id}")
+@router.delete("/tasks/{task_id}", response_class=FastJSONResponse)
 async def delete_task(
     task_id: str = Path(..., description="Task ID"),
     db: AsyncSession = Depends(get_db)
 ):
     """Delete a task"""
     try:
-        result = await db.execute(select(TaskDB).where(TaskDB.id == task_id))
-        task_record = result.scalar_one_or_none()
+        task_record = await db.get(TaskDB, task_id)
         
         if not task_record:
             raise HTTPException(status_code=404, detail="Task not found")
@@ -233,31 +227,18 @@ async def delete_task(
         raise HTTPException(status_code=500, detail=f"Failed to delete task: {str(e)}")
 
 
-@router.get("/tasks/{task_id}", response_model=Task)
+@router.get("/tasks/{task_id}", responses={200: {"model": Task}})
 async def get_task(
     task_id: str = Path(..., description="Task ID"),
     db: AsyncSession = Depends(get_db)
 ):
     """Get a specific task by ID"""
     try:
-        result = await db.execute(select(TaskDB).where(TaskDB.id == task_id))
-        task_record = result.scalar_one_or_none()
+        task_record = await db.get(TaskDB, task_id)
         
         if not task_record:
             raise HTTPException(status_code=404, detail="Task not found")
         
-        # Convert context_artifacts back to proper format
-        context_artifacts = []
-        for artifact_dict in (task_record.context_artifacts or []):
-            context_artifacts.append({
-                "id": artifact_dict["id"],
-                "type": artifact_dict["type"],
-                "source": artifact_dict["source"],
-                "title": artifact_dict["title"],
-                "status": artifact_dict.get("status"),
-                "url": artifact_dict.get("url")
-            })
-        
         task = Task(
             id=task_record.id,
             title=task_record.title,
@@ -268,11 +249,11 @@ async def get_task(
             due_date=task_record.due_date,
             created_at=task_record.created_at,
             updated_at=task_record.updated_at,
-            context_artifacts=context_artifacts,
-            subtasks=task_record.subtasks or []
+            context_artifacts=_artifacts(task_record.context_artifacts),
+            subtasks=task_record.subtask_list
         )
         
-        return task
+        return _task_response(task)
         
     except HTTPException:
         raise
@@ -8,6 +8,12 @@ from app.models import WindowLink
 
 router = APIRouter(tags=["windows"])
 
+# Supported tools, in the order listed in error messages
+_TOOLS = ("jama", "jira", "windchill", "outlook", "email")
+_VALID_TOOLS = frozenset(_TOOLS)
+_TOOL_TITLES = {tool: tool.title() for tool in _TOOLS}
+_INVALID_TOOL_DETAIL = f"Invalid tool. Must be one of: {', '.join(_TOOLS)}"
+
 
 @router.get("/windows/{tool}/{item_id}", response_model=WindowLink)
 async def get_window_link(
@@ -15,19 +21,19 @@ async def get_window_link(
     item_id: str = Path(..., description="Item ID to open")
 ):
     """Get window link for external system"""
-    settings = get_settings()
-    
     # Validate tool
-    valid_tools = ["jama", "jira", "windchill", "outlook", "email"]
-    if tool not in valid_tools:
-        raise HTTPException(status_code=400, detail=f"Invalid tool. Must be one of: {', '.join(valid_tools)}")
+    if tool not in _VALID_TOOLS:
+        raise HTTPException(status_code=400, detail=_INVALID_TOOL_DETAIL)
+    
+    # get_settings is cached, so this does not re-read the environment
+    base_url = get_settings().FDS_BASE_URL
     
     try:
         # Generate window link pointing to FDS mock window
         window_link = WindowLink(
-            url=f"{settings.FDS_BASE_URL}/mock/windows/{tool}/{item_id}",
+            url=f"{base_url}/mock/windows/{tool}/{item_id}",
             read_only=True,
-            title=f"{tool.title()} - {item_id}",
+            title=f"{_TOOL_TITLES[tool]} - {item_id}",
             tool=tool
         )
         
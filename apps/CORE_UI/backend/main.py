@@ -5,11 +5,14 @@ FastAPI application serving as the API gateway for the React frontend.
 
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 from contextlib import asynccontextmanager
 import logging
+import httpx
 from dotenv import load_dotenv
 
 from app.config import get_settings
+from app.database import init_db
 from app.routers import (
     pulse,
     impact,
@@ -34,7 +37,9 @@ logger = logging.getLogger("core-se-backend")
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Initialize database and agent service on startup"""
-    # await init_db()  # Disabled for now
+    # Create any missing tables and indexes; idempotent, so existing databases
+    # pick up schema added after they were created
+    await init_db()
     
     # Initialize agent service
     from src.agents import AgentService
@@ -57,8 +62,27 @@ async def lifespan(app: FastAPI):
         logger.error(f"Failed to initialize agent service: {e}")
         logger.info("Continuing without agent service")
     
+    # One pooled OpenAI client shared by every AI endpoint
+    app.state.openai = ai.create_openai_client()
+    
+    # Load the chat tokenizer up front; the first load may download its BPE file
+    await run_in_threadpool(ai.load_encoding, settings.OPENAI_MODEL)
+    
+    # One pooled HTTP/2 client for FDS calls, so requests reuse connections
+    app.state.http = httpx.AsyncClient(
+        transport=httpx.AsyncHTTPTransport(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=100, max_connections=200),
+            retries=1
+        )
+    )
+    
     yield
     
+    if app.state.openai is not None:
+        await app.state.openai.close()
+    await app.state.http.aclose()
+    
     # Shutdown agent service
     try:
         service = AgentService.get_instance()
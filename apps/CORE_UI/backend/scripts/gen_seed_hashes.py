@@ -0,0 +1,34 @@
+"""
+Generate the password hashes embedded for the demo accounts
+
+Prints SEED_PASSWORD_HASHES for app/routers/auth.py. Re-run and paste the
+output whenever a demo password or the Argon2 cost settings change.
+"""
+
+import sys
+import os
+
+# Add the backend directory to Python path
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+from app.auth import hash_password
+
+# Demo accounts and their plain-text passwords
+DEMO_PASSWORDS = {
+    "admin": "admin123",
+    "sys_engineer": "engineer123",
+    "analyst": "analyst123",
+}
+
+# Password the login dummy hash is computed from; it never matches an account
+DUMMY_PASSWORD = "invalid"
+
+
+if __name__ == "__main__":
+    print("SEED_PASSWORD_HASHES = {")
+    for username, password in DEMO_PASSWORDS.items():
+        print(f'    "{username}": "{hash_password(password)}",')
+    print("}")
+    print()
+    print(f'DUMMY_PASSWORD_HASH = "{hash_password(DUMMY_PASSWORD)}"')
@@ -3,6 +3,7 @@
 Test script for authentication endpoints
 """
 
+import base64
 import requests
 import json
 
@@ -125,6 +126,34 @@ def test_auth_endpoints():
     except Exception as e:
         print(f"✗ Error: {e}")
     
+    # Test 7: Profile keeps its flat response shape
+    print("\n7. Testing profile response shape...")
+    try:
+        response = requests.get(f"{BASE_URL}/profile", headers=headers)
+        profile = response.json()
+        expected = {"id", "username", "email", "first_name", "last_name", "city", "timezone",
+                    "communication_style", "interests", "goals", "work_style"}
+        if response.status_code == 200 and expected <= profile.keys() and not {"profile", "prefs"} & profile.keys():
+            print(f"✓ Profile fields are flat")
+        else:
+            print(f"✗ Unexpected profile response: {response.status_code} - {response.text}")
+    except Exception as e:
+        print(f"✗ Error: {e}")
+    
+    # Test 8: Malformed jti after a revocation is rejected, not a server error
+    print("\n8. Testing token with a malformed jti...")
+    try:
+        requests.post(f"{BASE_URL}/auth/logout", headers=headers)
+        encode = lambda data: base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b"=").decode()
+        forged = f'{encode({"alg": "HS256", "typ": "JWT"})}.{encode({"sub": "admin", "jti": [1]})}.c2ln'
+        response = requests.get(f"{BASE_URL}/auth/me", headers={"Authorization": f"Bearer {forged}"})
+        if response.status_code == 401:
+            print(f"✓ Malformed jti rejected with 401")
+        else:
+            print(f"✗ Malformed jti returned {response.status_code} - {response.text}")
+    except Exception as e:
+        print(f"✗ Error: {e}")
+    
     print("\n=== Authentication System Test Complete ===")
 
 if __name__ == "__main__":